@@ -0,0 +1,38 @@
+"""
+Headless benchmarks, run as `python -m chrono.bench <benchmark>`
+"""
+
+from argparse import ArgumentParser
+import json
+
+from chrono.bench import level, physics, playtest, sweep, timeline
+
+BENCHMARKS = {
+    "level": level,
+    "physics": physics,
+    "playtest": playtest,
+    "sweep": sweep,
+    "timeline": timeline,
+}
+
+
+def main():
+    parser = ArgumentParser(prog="python -m chrono.bench")
+    parser.add_argument("--json", action="store_true", help="print the results as json")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    for name, module in BENCHMARKS.items():
+        module.add_arguments(subparsers.add_parser(name))
+
+    args = parser.parse_args()
+    module = BENCHMARKS[args.benchmark]
+    result = module.run(args)
+    if result is None:
+        return  # It streamed its own output as it went
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        module.report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from argparse import ArgumentParser, Namespace
+from time import perf_counter_ns
+
+import numpy as np
+
+from chrono.game.level import PATHS, PLATFORM, POINT, TERRAIN, TRIGGER, Level
+
+TILE = 32.0
+
+
+def add_arguments(parser: ArgumentParser):
+    parser.add_argument(
+        "--tiles",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="terrain tiles in each generated level, there is a platform and trigger per 100",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="loads timed per level, the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def generate(tiles: int, seed: int = 0) -> Level:
+    """A level of roughly square terrain tiles scattered over a grid, with some platforms and triggers."""
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(tiles)))
+    names = ["", "floor", "wall", "square", "rectangle"]
+
+    terrain = np.zeros(tiles, dtype=TERRAIN)
+    cells = rng.choice(side * side, tiles, replace=False)
+    terrain["texture"] = rng.integers(1, 3, tiles)
+    terrain["position"] = np.stack((cells % side, cells // side), axis=1) * TILE
+    terrain["size"] = TILE
+
+    platforms = np.zeros(max(1, tiles // 100), dtype=PLATFORM)
+    platforms["texture"] = names.index("rectangle")
+    platforms["size"] = (64.0, 16.0)
+    platforms["path"] = rng.integers(0, len(PATHS), len(platforms))
+    platforms["a"] = rng.uniform(0.0, side * TILE, (len(platforms), 2))
+    platforms["b"] = platforms["a"] + rng.uniform(-128.0, 128.0, (len(platforms), 2))
+    platforms["period"] = rng.uniform(2.0, 10.0, len(platforms))
+
+    # Piecewise platforms loop through four points around a
+    piecewise = np.flatnonzero(platforms["path"] == PATHS.index("piecewise"))
+    platforms["first"][piecewise] = 4 * np.arange(len(piecewise))
+    platforms["count"][piecewise] = 4
+    corners = rng.uniform(-128.0, 128.0, (len(piecewise), 4, 2))
+    points = np.zeros(4 * len(piecewise), dtype=POINT)
+    points["position"] = (platforms["a"][piecewise][:, None] + corners).reshape(-1, 2)
+
+    # Every trigger takes out a named tile
+    triggers = np.zeros(len(platforms), dtype=TRIGGER)
+    for idx, target in enumerate(rng.choice(tiles, len(triggers), replace=False)):
+        terrain[target]["name"] = len(names)
+        triggers[idx]["target"] = len(names)
+        names.append(f"door_{idx}")
+    triggers["texture"] = names.index("square")
+    triggers["position"] = rng.uniform(0.0, side * TILE, (len(triggers), 2))
+    triggers["size"] = TILE
+    triggers["colour"] = (255, 0, 0, 120)
+
+    return Level(
+        names,
+        (side * TILE, side * TILE),
+        (0.0, 0.0),
+        (side * TILE, side * TILE),
+        terrain,
+        platforms,
+        triggers,
+        points,
+    )
+
+
+def _best_ns(load, repeats: int) -> int:
+    best = None
+    for _ in range(repeats):
+        start = perf_counter_ns()
+        load()
+        taken = perf_counter_ns() - start
+        best = taken if best is None else min(best, taken)
+    return best
+
+
+def run(args: Namespace) -> dict:
+    """Generate levels of each size and time loading them from each form."""
+    results = []
+    for tiles in args.tiles:
+        level = generate(tiles, args.seed)
+        text, data = level.to_toml(), level.to_bytes()
+
+        toml_ns = _best_ns(lambda: Level.from_toml(text), args.repeats)
+        binary_ns = _best_ns(lambda: Level.from_bytes(data), args.repeats)
+        results.append(
+            {
+                "tiles": tiles,
+                "platforms": len(level.platforms),
+                "triggers": len(level.triggers),
+                "toml_bytes": len(text.encode("utf-8")),
+                "binary_bytes": len(data),
+                "toml_ms": toml_ns / 1e6,
+                "binary_ms": binary_ns / 1e6,
+            }
+        )
+    return {"repeats": args.repeats, "levels": results}
+
+
+def report(result: dict):
+    print(f"level loading, best of {result['repeats']}")
+    print(
+        f"{'tiles':>8} {'toml KiB':>10} {'binary KiB':>11} {'toml ms':>10} {'binary ms':>10} {'speedup':>8}"
+    )
+    for row in result["levels"]:
+        print(
+            f"{row['tiles']:>8} {row['toml_bytes'] / 1024:>10.1f} {row['binary_bytes'] / 1024:>11.1f} "
+            f"{row['toml_ms']:>10.3f} {row['binary_ms']:>10.3f} "
+            f"{row['toml_ms'] / max(row['binary_ms'], 1e-9):>8.0f}"
+        )
@@ -0,0 +1,111 @@
+from argparse import ArgumentParser, Namespace
+from time import perf_counter_ns
+import tracemalloc
+
+from chrono.game.physics import Physics
+from chrono.game.physics_stats import PHASES
+from chrono.bench.scenes import MODES, SCENES, SceneDescription, step
+
+
+def add_arguments(parser: ArgumentParser):
+    parser.add_argument(
+        "--scenes", nargs="+", choices=tuple(SCENES), default=list(SCENES)
+    )
+    parser.add_argument("--bodies", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--mode", choices=tuple(MODES), default="array")
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument(
+        "--warmup", type=int, default=0, help="steps to run before measuring"
+    )
+
+
+def _measure_allocations(physics: Physics, steps: int) -> dict[str, float]:
+    # Done as its own pass as tracing slows every allocation down. Each step's
+    # allocations are the blocks each line of code holds after it and didn't
+    # before, so a line that frees as much as it allocates within the step
+    # isn't counted
+    tracemalloc.start()
+    # The snapshots themselves are left out
+    own = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    peak = allocations = 0
+    snapshot = tracemalloc.take_snapshot().filter_traces(own)
+    for _ in range(steps):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        step(physics)
+        _, step_peak = tracemalloc.get_traced_memory()
+        peak += step_peak - before
+
+        previous, snapshot = snapshot, tracemalloc.take_snapshot().filter_traces(own)
+        allocations += sum(
+            max(0, diff.count_diff) for diff in snapshot.compare_to(previous, "lineno")
+        )
+    tracemalloc.stop()
+    return {
+        "allocations_per_step": allocations / steps,
+        "peak_bytes_per_step": peak / steps,
+    }
+
+
+def run_scene(scene: str, bodies: int, mode: str, steps: int, warmup: int) -> dict:
+    with SceneDescription(scene, bodies, mode).build() as physics:
+        for _ in range(warmup):
+            step(physics)
+
+        stats = physics.enable_stats(steps)
+        start = perf_counter_ns()
+        for _ in range(steps):
+            step(physics)
+        elapsed = perf_counter_ns() - start
+        summary = stats.summary()
+        physics.disable_stats()
+        # Carries on from where the timed steps stopped so it sees the same scene
+        allocations = _measure_allocations(physics, min(steps, 60))
+        rate = physics.fixed_clock.rate
+
+    phases = summary["phase_us"]
+    # Outside of the phases, mostly the timing itself
+    phases["other"] = elapsed / steps / 1000.0 - summary["step_us"]
+    # The residual is only worked out for the stats, the game never pays for it
+    steps_per_second = 1e6 / (summary["step_us"] - phases["residual"])
+    return {
+        "scene": scene,
+        "bodies": bodies,
+        "mode": mode,
+        "steps": steps,
+        "dt": rate,
+        "steps_per_second": steps_per_second,
+        "realtime": steps_per_second * rate,
+        "phase_us": phases,
+        "counts": summary["counts"],
+        "residual": summary["residual"],
+        "allocations": allocations,
+    }
+
+
+def run(args: Namespace) -> dict:
+    results = [
+        run_scene(scene, bodies, args.mode, args.steps, args.warmup)
+        for scene in args.scenes
+        for bodies in args.bodies
+    ]
+    return {"results": results}
+
+
+def report(result: dict):
+    print("physics, phase times in us per step")
+    header = (
+        f"{'scene':>8} {'mode':>8} {'bodies':>6} {'steps/s':>9} {'realtime':>9}"
+        + "".join(f" {name[:9]:>9}" for name in PHASES)
+        + f" {'other':>9} {'resid imp':>9} {'allocs':>9}"
+    )
+    print(header)
+    for row in result["results"]:
+        phases = row["phase_us"]
+        print(
+            f"{row['scene']:>8} {row['mode']:>8} {row['bodies']:>6} "
+            f"{row['steps_per_second']:>9.1f} {row['realtime']:>8.1f}x"
+            + "".join(f" {phases[name]:>9.1f}" for name in PHASES)
+            + f" {phases['other']:>9.1f} {row['residual']:>9.3f}"
+            + f" {row['allocations']['allocations_per_step']:>9.1f}"
+        )
@@ -0,0 +1,63 @@
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from time import perf_counter_ns
+
+from chrono.game.headless import log_commands, parse_command, play
+from chrono.game.level import load_level
+from chrono.game.simulation import Simulation
+from chrono.recording import InputLog
+from chrono.scheduler import SIMULATION_RATE
+
+
+def add_arguments(parser: ArgumentParser):
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        default=["level_1"],
+        help="levels in resources/data to play, each with the same script",
+    )
+    parser.add_argument(
+        "--commands",
+        nargs="*",
+        type=parse_command,
+        default=[],
+        help="the input script, as TIME:ACTION, TIME:-ACTION or TIME:horizontal=VALUE",
+    )
+    parser.add_argument("--seconds", type=float, default=60.0, help="the longest to play each level for")
+    parser.add_argument(
+        "--replay", type=Path, help="play input recorded by the game with --record instead of a script"
+    )
+
+
+def run(args: Namespace) -> dict:
+    """Load each level and play the script through it with no window."""
+    commands, rate = args.commands, SIMULATION_RATE
+    if args.replay is not None:
+        log = InputLog.from_bytes(args.replay.read_bytes())
+        commands, rate = log_commands(log), log.rate
+
+    results = []
+    for name in args.levels:
+        start = perf_counter_ns()
+        sim = Simulation(load_level(name))
+        load_ns = perf_counter_ns() - start
+
+        result = play(sim, commands, args.seconds, rate)
+        result["level"] = name
+        result["load_ms"] = load_ns / 1e6
+        results.append(result)
+    return {"commands": len(commands), "seconds": args.seconds, "levels": results}
+
+
+def report(result: dict):
+    print(f"playtest, {result['commands']} commands for up to {result['seconds']:.0f}s")
+    print(
+        f"{'level':>12} {'load ms':>8} {'steps':>7} {'step ms':>8} {'x realtime':>11} {'won at':>7} {'falls':>6}"
+    )
+    for row in result["levels"]:
+        won_at = "-" if row["won_at"] is None else f"{row['won_at']:.2f}"
+        print(
+            f"{row['level']:>12} {row['load_ms']:>8.2f} {row['steps']:>7} "
+            f"{row['wall_ms'] / max(row['steps'], 1):>8.4f} {row['realtime']:>11.0f} "
+            f"{won_at:>7} {row['falls']:>6}"
+        )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable
+
+from arcade import Vec2, LBWH
+from arcade.clock import Clock, FixedClock
+
+from chrono.game.physics import (
+    ITERATION_NUMBER,
+    Physics,
+    Body,
+    StaticGravity,
+    StaticDrag,
+    StaticBounds,
+    Spring,
+)
+from chrono.game.physics_array import ArrayPhysics
+from chrono.game.physics_parallel import ParallelPhysics
+
+# Scenes for driving chrono.game.physics without a window
+
+BOUNDS = LBWH(0.0, 0.0, 1280.0, 720.0)
+GRAVITY = 2000.0
+BOX_SIZE = 16.0
+SPRING_TENSION = 100.0
+
+MODES: dict[str, type[Physics]] = {
+    "array": ArrayPhysics,
+    "list": Physics,
+    "parallel": ParallelPhysics,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SceneDescription:
+    # Everything needed to build a world, kept to plain values so it can be
+    # pickled across to another process, written to json, or used as a key.
+    scene: str
+    bodies: int
+    mode: str = "array"
+    rate: float = 1.0 / 60.0
+    gravity: float = GRAVITY
+    drag: float = 0.0
+    tension: float = SPRING_TENSION
+    iterations: int = ITERATION_NUMBER
+
+    def build(self) -> Physics:
+        """Make a world with its own fixed clock, so it can be stepped alongside any other."""
+        physics = MODES[self.mode](fixed_clock=FixedClock(Clock(), self.rate))
+        physics.iterations = self.iterations
+        bodies = SCENES[self.scene](self, physics)
+        physics.add_force(StaticGravity(bodies, Vec2(0.0, -1.0), self.gravity))
+        if self.drag > 0.0:
+            physics.add_force(StaticDrag(bodies, self.drag))
+        return physics
+
+
+def step(physics: Physics):
+    # The fixed clock only accepts its own rate, which is what a window would tick it with
+    physics.fixed_clock.tick(physics.fixed_clock.rate)
+    physics.fixed_update()
+
+
+def falling_boxes(description: SceneDescription, physics: Physics) -> list[Body]:
+    """Boxes dropped in a grid over the bottom of the bounds, falling under gravity into it."""
+    columns = max(1, int(BOUNDS.width // (2 * BOX_SIZE)) - 1)
+    bodies = []
+    for idx in range(description.bodies):
+        row, column = divmod(idx, columns)
+        position = Vec2(
+            BOUNDS.left + (column + 1) * 2 * BOX_SIZE,
+            BOUNDS.bottom + (row + 1) * 2 * BOX_SIZE,
+        )
+        body = physics.add_body(Body(position, Vec2(), (BOX_SIZE, BOX_SIZE)))
+        physics.add_contraint(StaticBounds(body, BOUNDS))
+        bodies.append(body)
+    return bodies
+
+
+def spring_chain(description: SceneDescription, physics: Physics) -> list[Body]:
+    """
+    Boxes hung side by side from springs, pulled sideways so they swing into each other.
+
+    Springs only pull towards a fixed point, so the chain is held together
+    by neighbouring boxes colliding rather than springs between them.
+    """
+    per_row = max(1, int(BOUNDS.width // BOX_SIZE) - 2)
+    bodies = []
+    for idx in range(description.bodies):
+        row, column = divmod(idx, per_row)
+        anchor = Vec2(
+            BOUNDS.left + (column + 1) * BOX_SIZE,
+            BOUNDS.top - (row + 1) * 4 * BOX_SIZE,
+        )
+        position = anchor + Vec2(BOX_SIZE, -2 * BOX_SIZE)
+        body = physics.add_body(Body(position, Vec2(), (BOX_SIZE, BOX_SIZE)))
+        physics.add_force(Spring([body], anchor, description.tension, BOX_SIZE))
+        physics.add_contraint(StaticBounds(body, BOUNDS))
+        bodies.append(body)
+    return bodies
+
+
+def dense_pile(description: SceneDescription, physics: Physics) -> list[Body]:
+    """Boxes overlapping by half their size in a narrow column, so every box starts in contact."""
+    columns = 4
+    left = BOUNDS.center_x - columns * BOX_SIZE / 2
+    bodies = []
+    for idx in range(description.bodies):
+        row, column = divmod(idx, columns)
+        position = Vec2(
+            left + (column + 0.5) * BOX_SIZE / 2 + BOX_SIZE / 2,
+            BOUNDS.bottom + (row + 1) * BOX_SIZE / 2,
+        )
+        body = physics.add_body(Body(position, Vec2(), (BOX_SIZE, BOX_SIZE)))
+        physics.add_contraint(StaticBounds(body, BOUNDS))
+        bodies.append(body)
+    return bodies
+
+
+SCENES: dict[str, Callable[[SceneDescription, Physics], list[Body]]] = {
+    "boxes": falling_boxes,
+    "springs": spring_chain,
+    "pile": dense_pile,
+}
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from itertools import product
+from math import ceil
+from time import perf_counter
+from typing import Iterable, Iterator
+import json
+import os
+
+import numpy as np
+
+from chrono.bench.scenes import (
+    BOUNDS,
+    BOX_SIZE,
+    GRAVITY,
+    MODES,
+    SCENES,
+    SPRING_TENSION,
+    SceneDescription,
+    step,
+)
+from chrono.game.physics import ITERATION_NUMBER
+
+
+def simulate(description: SceneDescription, seconds: float) -> dict:
+    """Build a world from its description and step it headlessly, summarising how it ended up."""
+    start = perf_counter()
+    with description.build() as physics:
+        steps = ceil(seconds / description.rate)
+        settled_step = None
+        for idx in range(steps):
+            step(physics)
+            if settled_step is None and not physics.awake_count:
+                settled_step = idx
+        elapsed = perf_counter() - start
+
+        count = len(physics)
+        awake = physics.awake_count
+        positions, velocities = np.zeros((count, 2)), np.zeros((count, 2))
+        physics.capture(positions, velocities, np.zeros(count, dtype=np.int64))
+
+    speeds = np.sqrt(np.einsum("ij,ij->i", velocities, velocities))
+    # Anything more than a box outside the bounds has tunnelled out
+    margin = BOX_SIZE
+    escaped = (
+        (positions[:, 0] < BOUNDS.left - margin)
+        | (positions[:, 0] > BOUNDS.right + margin)
+        | (positions[:, 1] < BOUNDS.bottom - margin)
+        | (positions[:, 1] > BOUNDS.top + margin)
+    )
+    return {
+        "description": asdict(description),
+        "seconds": seconds,
+        "wall_seconds": elapsed,
+        "settled_seconds": (
+            None if settled_step is None else settled_step * description.rate
+        ),
+        "awake": awake,
+        "max_speed": float(speeds.max()) if count else 0.0,
+        "mean_speed": float(speeds.mean()) if count else 0.0,
+        "top": float(positions[:, 1].max()) if count else 0.0,
+        "escaped": int(escaped.sum()),
+    }
+
+
+def run_worlds(
+    descriptions: Iterable[SceneDescription],
+    seconds: float,
+    max_workers: int | None = None,
+) -> Iterator[dict]:
+    """
+    Simulate every described world in a pool of processes, one per core by default.
+
+    Every world has its own clocks so they don't interfere, and each one's
+    summary is yielded as soon as it finishes rather than in the order given.
+    """
+    with ProcessPoolExecutor(max_workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(simulate, description, seconds)
+            for description in descriptions
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def add_arguments(parser: ArgumentParser):
+    # Every option takes several values, and every combination of them is run
+    parser.add_argument(
+        "--scenes", nargs="+", choices=tuple(SCENES), default=["boxes"]
+    )
+    parser.add_argument("--bodies", type=int, nargs="+", default=[64])
+    parser.add_argument("--mode", choices=tuple(MODES), default="array")
+    parser.add_argument("--gravity", type=float, nargs="+", default=[GRAVITY])
+    parser.add_argument("--drag", type=float, nargs="+", default=[0.0])
+    parser.add_argument(
+        "--tension", type=float, nargs="+", default=[SPRING_TENSION]
+    )
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=[ITERATION_NUMBER]
+    )
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=None)
+
+
+def run(args: Namespace) -> None:
+    # Results are streamed as each world finishes, so nothing is returned to report
+    descriptions = [
+        SceneDescription(scene, bodies, args.mode, 1.0 / 60.0, *tuning)
+        for scene, bodies, *tuning in product(
+            args.scenes,
+            args.bodies,
+            args.gravity,
+            args.drag,
+            args.tension,
+            args.iterations,
+        )
+    ]
+    if not args.json:
+        print(
+            f"{'scene':>8} {'bodies':>6} {'gravity':>8} {'drag':>6} {'tension':>8} {'iters':>5}"
+            f" {'settled s':>9} {'awake':>6} {'max v':>8} {'escaped':>7} {'wall s':>7}"
+        )
+    for result in run_worlds(descriptions, args.seconds, args.workers):
+        if args.json:
+            print(json.dumps(result), flush=True)
+            continue
+        d = result["description"]
+        settled = result["settled_seconds"]
+        print(
+            f"{d['scene']:>8} {d['bodies']:>6} {d['gravity']:>8.1f} {d['drag']:>6.3f}"
+            f" {d['tension']:>8.1f} {d['iterations']:>5}"
+            f" {'-' if settled is None else f'{settled:.2f}':>9} {result['awake']:>6}"
+            f" {result['max_speed']:>8.1f} {result['escaped']:>7} {result['wall_seconds']:>7.2f}",
+            flush=True,
+        )
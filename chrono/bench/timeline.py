@@ -0,0 +1,74 @@
+from argparse import ArgumentParser, Namespace
+from random import Random
+from time import perf_counter_ns
+
+from chrono.game.timeline import Timeline
+from chrono.bench.scenes import SCENES, SceneDescription, step
+
+
+def add_arguments(parser: ArgumentParser):
+    parser.add_argument(
+        "--scene",
+        choices=SCENES,
+        default="springs",
+        help="the world to record, which should stay awake or only idle is measured",
+    )
+    parser.add_argument("--bodies", type=int, default=256)
+    parser.add_argument(
+        "--windows",
+        type=float,
+        nargs="+",
+        default=[15.0, 30.0, 60.0, 120.0],
+        help="rewind window lengths to measure, in seconds",
+    )
+    parser.add_argument("--seeks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def run(args: Namespace) -> dict:
+    """Record the scene for each window length, then time random seeks into it."""
+    rng = Random(args.seed)
+    results = []
+    for window in args.windows:
+        physics = SceneDescription(args.scene, args.bodies).build()
+        timeline = Timeline.from_seconds(physics, window, max_bodies=args.bodies)
+        steps = timeline.window
+
+        start = perf_counter_ns()
+        for _ in range(steps):
+            step(physics)
+            timeline.record()
+        record_ns = perf_counter_ns() - start
+
+        targets = [rng.randint(timeline.oldest, timeline.newest) for _ in range(args.seeks)]
+        start = perf_counter_ns()
+        for target in targets:
+            timeline.seek(target)
+        seek_ns = perf_counter_ns() - start
+
+        results.append(
+            {
+                "window_seconds": window,
+                "awake": physics.awake_count,
+                "steps": steps,
+                "bytes": timeline.nbytes,
+                "bytes_per_minute": timeline.bytes_per_minute(),
+                "full_bytes_per_minute": args.bodies * 5 * 8 * 60.0 / physics.fixed_clock.rate,
+                "record_us_per_step": record_ns / steps / 1000.0,
+                "seek_us": seek_ns / args.seeks / 1000.0,
+            }
+        )
+    return {"scene": args.scene, "bodies": args.bodies, "windows": results}
+
+
+def report(result: dict):
+    print(f"timeline, {result['scene']} with {result['bodies']} bodies")
+    print(
+        f"{'window s':>9} {'steps':>7} {'awake':>6} {'KiB':>10} {'KiB/min':>10} {'full KiB/min':>13} {'seek us':>9}"
+    )
+    for row in result["windows"]:
+        print(
+            f"{row['window_seconds']:>9.1f} {row['steps']:>7} {row['awake']:>6} {row['bytes'] / 1024:>10.1f} "
+            f"{row['bytes_per_minute'] / 1024:>10.1f} {row['full_bytes_per_minute'] / 1024:>13.1f} "
+            f"{row['seek_us']:>9.1f}"
+        )
@@ -1,11 +1,20 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
 from chrono.window import Window
 from arcade import load_font
 from resources import get_font_path
 
 
 def main():
+    parser = ArgumentParser(prog="chrono")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", type=Path, help="save the session's input to a file")
+    group.add_argument("--replay", type=Path, help="play back input saved with --record")
+    args = parser.parse_args()
+
     for font in ["vcr", "gohu", "cmu"]:
         p = get_font_path(font)
         load_font(p)
 
-    Window.launch()
+    Window.launch(args.record, args.replay)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+from arcade.types import Rect
+
+if TYPE_CHECKING:
+    from chrono.game.physics import Body
+
+
+class SweepAndPrune:
+    # Finds which bodies' bounds overlap without testing every pair.
+    # Bodies are kept in a list sorted by their left edge which persists between
+    # steps. As bodies move coherently the list is almost sorted already, and
+    # timsort finishes an almost sorted list in close to linear time. A single
+    # sweep along the x axis then only tests bodies whose x ranges overlap.
+
+    def __init__(self) -> None:
+        self._order: list[Body] = []
+        self._members: set[Body] = set()
+        self._removed: bool = False  # Removed bodies are only pruned from the order on update
+        # Each body's bounds and the sorted left edges as of the last update
+        self._bounds: dict[Body, Rect] = {}
+        self._lefts: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add(self, body: Body):
+        if body in self._members:
+            return
+        self._members.add(body)
+        self._order.append(body)
+
+    def remove(self, body: Body):
+        if body not in self._members:
+            return
+        self._members.remove(body)
+        self._removed = True
+
+    def update(self) -> list[tuple[Body, Body]]:
+        """
+        Re-sort the axis and sweep it for overlapping bounds.
+
+        :return: every pair of bodies whose bounds overlap, excluding pairs where both are static.
+        """
+        if self._removed:
+            # A body removed then added again will be in the order twice
+            order = dict.fromkeys(self._order)
+            self._order = [body for body in order if body in self._members]
+            self._removed = False
+
+        bounds = self._bounds = {body: body.bounds for body in self._order}
+        self._order.sort(key=lambda body: bounds[body].left)
+        self._lefts = [bounds[body].left for body in self._order]
+
+        pairs: list[tuple[Body, Body]] = []
+        active: list[Body] = []
+        for body in self._order:
+            rect = bounds[body]
+            left, bottom, top = rect.left, rect.bottom, rect.top
+            # Anything that ends before this body starts can't touch anything further along
+            active = [other for other in active if bounds[other].right > left]
+            for other in active:
+                o_rect = bounds[other]
+                if o_rect.bottom >= top or bottom >= o_rect.top:
+                    continue
+                if body.static and other.static:
+                    continue
+                # Order the pair by handle so it identifies the same contact every step
+                pairs.append(
+                    (other, body) if other.handle < body.handle else (body, other)
+                )
+            active.append(body)
+        return pairs
+
+    def query(self, rect: Rect) -> list[Body]:
+        """
+        Find the bodies whose bounds overlapped a rect as of the last update.
+
+        Only the bodies starting before the rect ends are checked.
+        """
+        bounds = self._bounds
+        left, right, bottom, top = rect.left, rect.right, rect.bottom, rect.top
+        found = []
+        for body in self._order[: bisect_left(self._lefts, right)]:
+            other = bounds[body]
+            if other.right > left and other.bottom < top and bottom < other.top:
+                found.append(body)
+        return found
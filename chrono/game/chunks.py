@@ -0,0 +1,151 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from math import floor
+
+import numpy as np
+from arcade import Sprite, SpriteList
+from arcade.types import LRBT, Rect
+
+from chrono.game.grid import SpatialGrid, sprite_bounds
+from chrono.game.level import LevelSprites
+
+CHUNK_SIZE = 512.0  # Terrain is grouped by which square of this size its centre is in
+LOAD_MARGIN = 256.0  # How far past the edge of the view chunks start loading
+# How far past the edge of the view chunks stay loaded, bigger than the load
+# margin so walking back and forth over a boundary doesn't reload anything
+EVICT_MARGIN = 768.0
+
+
+@dataclass(slots=True)
+class Chunk:
+    rows: np.ndarray  # The level terrain rows in the chunk
+    bounds: Rect  # Covers all of its terrain, which can hang outside its square
+
+
+def _grow(rect: Rect, margin: float) -> Rect:
+    return LRBT(
+        rect.left - margin, rect.right + margin, rect.bottom - margin, rect.top + margin
+    )
+
+
+class ChunkStreamer:
+    # Keeps only the level's terrain near the view in memory.
+    # Terrain is split into chunks, each drawn from its own SpriteList. Any
+    # chunk that comes within LOAD_MARGIN of the view has its sprites made
+    # on a background thread, and once they're ready the list is uploaded
+    # and the sprites added to the terrain grid the player collides against.
+    # Chunks further than EVICT_MARGIN from the view are dropped again, so
+    # per frame cost depends on how much is near the view, not level size.
+
+    def __init__(
+        self, sprites: LevelSprites, rows: np.ndarray, terrain_grid: SpatialGrid[Sprite]
+    ) -> None:
+        self._sprites: LevelSprites = sprites
+        self._terrain_grid: SpatialGrid[Sprite] = terrain_grid
+
+        self._chunks: dict[tuple[int, int], Chunk] = {}
+        self._index: SpatialGrid[tuple[int, int]] = SpatialGrid(CHUNK_SIZE)
+        self._build_index(np.asarray(rows, dtype=np.int64))
+
+        self._loading: dict[tuple[int, int], Future[SpriteList[Sprite]]] = {}
+        self._active: dict[tuple[int, int], SpriteList[Sprite]] = {}
+        # Started when a chunk is first loaded, and again after closing
+        self._executor: ThreadPoolExecutor | None = None
+
+        # Textures are shared between chunks, so load them up front rather
+        # than having the loading thread race to add them
+        terrain = sprites.level.terrain
+        for texture in np.unique(terrain["texture"][rows]).tolist():
+            sprites.texture(texture)
+
+    def _build_index(self, rows: np.ndarray):
+        if not len(rows):
+            return
+        terrain = self._sprites.level.terrain[rows]
+        position, half = terrain["position"], terrain["size"] / 2.0
+        keys = np.floor(position / CHUNK_SIZE).astype(np.int64)
+
+        # Sort the rows so each chunk is one run, then get every run's bounds at once
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        keys, rows = keys[order], rows[order]
+        lower, upper = (position - half)[order], (position + half)[order]
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        lower = np.minimum.reduceat(lower, starts, axis=0)
+        upper = np.maximum.reduceat(upper, starts, axis=0)
+
+        for idx, (start, stop) in enumerate(zip(starts, np.r_[starts[1:], len(rows)])):
+            key = tuple(keys[start].tolist())
+            (left, bottom), (right, top) = lower[idx].tolist(), upper[idx].tolist()
+            bounds = LRBT(left, right, bottom, top)
+            self._chunks[key] = Chunk(rows[start:stop], bounds)
+            self._index.insert(key, bounds)
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def active(self) -> int:
+        return len(self._active)
+
+    @property
+    def loading(self) -> int:
+        return len(self._loading)
+
+    def update(self, view: Rect, wait: bool = False):
+        """
+        Start loading the chunks near the view, activate any that finished, and evict far ones.
+
+        :param view: the part of the level being shown.
+        :param wait: block until every chunk near the view is active, for
+        when the view jumps somewhere and the player could fall through.
+        """
+        near = _grow(view, LOAD_MARGIN)
+        for key in self._index.query(near):
+            if key in self._active or key in self._loading:
+                continue
+            if self._chunks[key].bounds.overlaps(near):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(1, thread_name_prefix="chunks")
+                self._loading[key] = self._executor.submit(self._build, key)
+
+        for key, future in tuple(self._loading.items()):
+            if wait or future.done():
+                del self._loading[key]
+                self._activate(key, future.result())
+
+        kept = _grow(view, EVICT_MARGIN)
+        for key in tuple(self._loading):
+            if not self._chunks[key].bounds.overlaps(kept) and self._loading[key].cancel():
+                del self._loading[key]
+        for key in tuple(self._active):
+            if not self._chunks[key].bounds.overlaps(kept):
+                self._evict(key)
+
+    def _build(self, key: tuple[int, int]) -> SpriteList[Sprite]:
+        # Runs on the loading thread so it mustn't touch OpenGL, the list stays lazy until activated
+        rows = self._chunks[key].rows
+        sprite_list: SpriteList[Sprite] = SpriteList(lazy=True, capacity=len(rows))
+        sprite_list.extend(self._sprites.blocks(rows))
+        return sprite_list
+
+    def _activate(self, key: tuple[int, int], sprite_list: SpriteList[Sprite]):
+        sprite_list.initialize()
+        for sprite in sprite_list:
+            self._terrain_grid.insert(sprite, sprite_bounds(sprite))
+        self._active[key] = sprite_list
+
+    def _evict(self, key: tuple[int, int]):
+        for sprite in self._active.pop(key):
+            self._terrain_grid.remove(sprite)
+
+    def draw(self, **kwargs):
+        for sprite_list in self._active.values():
+            sprite_list.draw(**kwargs)
+
+    def close(self):
+        """Stop the loading thread. Active chunks are kept, and updating again starts a new one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._loading.clear()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(slots=True, eq=False)
+class Event:
+    time: float
+    apply: Callable[[], None]
+    undo: Callable[[], None]
+
+
+class EventTimeline:
+    # Things that happened at times on a clock, and how to make them un-happen.
+    # Events are kept sorted by time, and `time` is where on the clock the
+    # world currently is, so every event at or before it has been applied.
+    # Moving the timeline to a new time only runs the events crossed on the
+    # way, found by bisecting, so nothing is checked while the clock sits
+    # between events however many there are. Going forward applies them in
+    # order and going back undoes them in reverse. Recording an event
+    # throws away any after it, as they belonged to a future that has been
+    # rewound and then played differently. Holding an event moves it later,
+    # past events recorded since, so its effect has to be the same whatever
+    # order events are applied in, like counting rather than setting.
+
+    def __init__(self, time: float = 0.0) -> None:
+        self.time: float = time
+        self._times: list[float] = []
+        self._events: list[Event] = []
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def applied(self) -> int:
+        """How many events have happened by the current time."""
+        return bisect_right(self._times, self.time)
+
+    @property
+    def last(self) -> Event | None:
+        return self._events[-1] if self._events else None
+
+    def record(self, apply: Callable[[], None], undo: Callable[[], None]) -> Event:
+        """
+        Make something happen now.
+
+        :param apply: makes the event happen, it is called straight away.
+        :param undo: makes the event un-happen.
+        :return: the event, which can be held with `hold`.
+        """
+        del self._events[self.applied :]
+        del self._times[len(self._events) :]
+
+        event = Event(self.time, apply, undo)
+        self._events.append(event)
+        self._times.append(self.time)
+        apply()
+        return event
+
+    def hold(self, event: Event) -> bool:
+        """
+        Move an applied event up to now, for something that is still happening.
+        Like recording, this throws away any events after now.
+
+        :return: False if the event isn't applied any more, so a new one is needed.
+        """
+        if event.time > self.time:
+            return False
+        idx = bisect_left(self._times, event.time)
+        stop = self.applied
+        while idx < stop and self._events[idx] is not event:
+            idx += 1
+        if idx == stop:
+            return False  # Rewound past and then replaced by another future
+
+        del self._events[stop:], self._times[stop:]
+        del self._events[idx], self._times[idx]
+        event.time = self.time
+        self._events.append(event)
+        self._times.append(self.time)
+        return True
+
+    def advance(self, time: float):
+        """Move to a new time on the clock, applying or undoing every event crossed on the way."""
+        if time > self.time:
+            start, stop = self.applied, bisect_right(self._times, time)
+            for event in self._events[start:stop]:
+                event.apply()
+        elif time < self.time:
+            start, stop = bisect_right(self._times, time), self.applied
+            for event in reversed(self._events[start:stop]):
+                event.undo()
+        self.time = time
+
+    def clear(self, time: float = 0.0):
+        self._events.clear()
+        self._times.clear()
+        self.time = time
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from math import floor
+from typing import Generic, Hashable, TypeVar
+
+from arcade import Sprite
+from arcade.types import Rect, XYWH
+
+T = TypeVar("T", bound=Hashable)
+
+CellRange = tuple[int, int, int, int]  # first column, last column, first row, last row
+
+
+def sprite_bounds(sprite: Sprite) -> Rect:
+    w, h, *_ = sprite.size
+    return XYWH(*sprite.position, w, h)
+
+
+class SpatialGrid(Generic[T]):
+    # Uniform grid over the plane for finding what is near a rect.
+    # Every item is listed in each cell its bounds cover. Static items are
+    # inserted once, and moving one only touches the cells it left or
+    # entered, so most moves change nothing. A query only looks in the
+    # cells the rect covers, so its cost depends on what is nearby rather
+    # than on how many items there are in total.
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size: float = cell_size
+        self._cells: dict[tuple[int, int], dict[T, None]] = {}
+        self._ranges: dict[T, CellRange] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._ranges
+
+    def _range(self, rect: Rect) -> CellRange:
+        size = self.cell_size
+        return (
+            floor(rect.left / size),
+            floor(rect.right / size),
+            floor(rect.bottom / size),
+            floor(rect.top / size),
+        )
+
+    def _add(self, item: T, cells: CellRange):
+        left, right, bottom, top = cells
+        for x in range(left, right + 1):
+            for y in range(bottom, top + 1):
+                self._cells.setdefault((x, y), {})[item] = None
+
+    def _discard(self, item: T, cells: CellRange):
+        left, right, bottom, top = cells
+        for x in range(left, right + 1):
+            for y in range(bottom, top + 1):
+                cell = self._cells[x, y]
+                del cell[item]
+                if not cell:
+                    del self._cells[x, y]
+
+    def insert(self, item: T, bounds: Rect):
+        if item in self._ranges:
+            self.move(item, bounds)
+            return
+        cells = self._ranges[item] = self._range(bounds)
+        self._add(item, cells)
+
+    def remove(self, item: T):
+        cells = self._ranges.pop(item, None)
+        if cells is not None:
+            self._discard(item, cells)
+
+    def move(self, item: T, bounds: Rect):
+        """Update an item's bounds, only touching the grid if it changed cells."""
+        cells = self._range(bounds)
+        old = self._ranges[item]
+        if cells == old:
+            return
+        self._discard(item, old)
+        self._add(item, cells)
+        self._ranges[item] = cells
+
+    def query(self, rect: Rect) -> list[T]:
+        """
+        Find every item listed in the cells a rect covers.
+
+        Items close to but not touching the rect can be returned, so their
+        bounds still need checking.
+        """
+        left, right, bottom, top = self._range(rect)
+        found: dict[T, None] = {}
+        cells = self._cells
+        for x in range(left, right + 1):
+            for y in range(bottom, top + 1):
+                cell = cells.get((x, y))
+                if cell is not None:
+                    found.update(cell)
+        return list(found)
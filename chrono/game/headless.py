@@ -0,0 +1,138 @@
+"""
+Play a level with no window, as fast as the machine can step it
+
+A script is a list of commands, each saying what the input becomes at a
+time into the run. As text every command is `TIME:ACTION` to press an
+action, `TIME:-ACTION` to release it, or `TIME:horizontal=VALUE` to steer,
+e.g. `0:horizontal=1 0.5:jump 0.7:-jump`. Input recorded from the game
+with `--record` can be played instead with `--replay`. Run it as
+`python -m chrono.game.headless <level> <commands>`.
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter_ns
+
+from chrono.game.level import load_level
+from chrono.game.simulation import Simulation
+from chrono.recording import InputLog
+from chrono.scheduler import SIMULATION_RATE
+
+HORIZONTAL = "horizontal"
+
+
+@dataclass(slots=True)
+class Command:
+    time: float  # Seconds into the run
+    action: str  # An action, or HORIZONTAL to steer
+    value: float  # 1.0 to press and 0.0 to release an action, or how far to steer
+
+
+def parse_command(text: str) -> Command:
+    time, _, action = text.partition(":")
+    if not action:
+        raise ValueError(f"{text!r} is not TIME:ACTION, TIME:-ACTION or TIME:horizontal=VALUE")
+    if action.startswith(HORIZONTAL + "="):
+        return Command(float(time), HORIZONTAL, float(action[len(HORIZONTAL) + 1 :]))
+    if action.startswith("-"):
+        return Command(float(time), action[1:], 0.0)
+    return Command(float(time), action, 1.0)
+
+
+def log_commands(log: InputLog) -> list[Command]:
+    """Turn recorded input into a script, which plays the same at the log's rate."""
+    commands = []
+    horizontal = 0.0
+    for idx, (changes, axes) in enumerate(log.ticks()):
+        time = idx * log.rate
+        for action, pressed in changes:
+            commands.append(Command(time, action, 1.0 if pressed else 0.0))
+        if axes.get(HORIZONTAL, 0.0) != horizontal:
+            horizontal = axes[HORIZONTAL]
+            commands.append(Command(time, HORIZONTAL, horizontal))
+    return commands
+
+
+def play(
+    sim: Simulation,
+    commands: list[Command],
+    seconds: float,
+    rate: float = SIMULATION_RATE,
+) -> dict:
+    """
+    Step a simulation through a script, stopping early if the player wins.
+
+    :param sim: the simulation to play, it is reset first.
+    :param commands: the script, each is applied before the first step at or after its time.
+    :param seconds: the longest to play for.
+    :param rate: the seconds each step simulates.
+    :return: how the run went, and how long it took.
+    """
+    commands = sorted(commands, key=lambda command: command.time)
+    sim.reset()
+    steps = int(seconds / rate)
+    falls = 0
+    won_at = None
+    next_command = 0
+
+    start = perf_counter_ns()
+    for idx in range(steps):
+        now = idx * rate
+        while next_command < len(commands) and commands[next_command].time <= now:
+            command = commands[next_command]
+            if command.action == HORIZONTAL:
+                sim.horizontal = command.value
+            else:
+                sim.on_action(command.action, command.value > 0.0)
+            next_command += 1
+
+        sim.step(rate)
+        if sim.won:
+            won_at = now + rate
+            steps = idx + 1
+            break
+        if sim.fell:
+            # Like the game, falling out starts the level again but the script carries on
+            falls += 1
+            horizontal = sim.horizontal
+            sim.reset()
+            sim.horizontal = horizontal
+    taken_ns = perf_counter_ns() - start
+
+    simulated = steps * rate
+    return {
+        "steps": steps,
+        "simulated_seconds": simulated,
+        "wall_ms": taken_ns / 1e6,
+        "realtime": simulated / max(taken_ns / 1e9, 1e-9),
+        "won_at": won_at,
+        "falls": falls,
+        "events": len(sim.events),
+        "position": tuple(sim.player.position),
+    }
+
+
+def main():
+    parser = ArgumentParser(prog="python -m chrono.game.headless")
+    parser.add_argument("level", help="the level in resources/data to play")
+    parser.add_argument("commands", nargs="*", type=parse_command, help="the input script")
+    parser.add_argument("--seconds", type=float, default=60.0, help="the longest to play for")
+    parser.add_argument("--replay", type=Path, help="play input recorded by the game instead")
+    args = parser.parse_args()
+
+    commands, rate = args.commands, SIMULATION_RATE
+    if args.replay is not None:
+        log = InputLog.from_bytes(args.replay.read_bytes())
+        commands, rate = log_commands(log), log.rate
+    result = play(Simulation(load_level(args.level)), commands, args.seconds, rate)
+    outcome = "no win" if result["won_at"] is None else f"won at {result['won_at']:.2f}s"
+    print(
+        f"{args.level}: {outcome}, {result['falls']} falls, "
+        f"{result['steps']} steps in {result['wall_ms']:.1f}ms ({result['realtime']:.0f}x realtime)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from math import ceil
+
+import numpy as np
+
+from chrono.game.physics import Physics
+
+
+class RewindHistory:
+    # A fixed length record of a Physics world's past steps so it can be rewound.
+    # Every step's positions, velocities, and body handles are written into
+    # preallocated ring buffers, so once full the oldest step is overwritten.
+    # Memory only depends on the capacity and number of bodies, never on how
+    # long the game has been running.
+
+    def __init__(self, physics: Physics, capacity: int, max_bodies: int = 64) -> None:
+        self._physics: Physics = physics
+        self.capacity: int = capacity
+        self.max_bodies: int = 0
+
+        self._positions: np.ndarray = np.zeros((capacity, 0, 2))
+        self._velocities: np.ndarray = np.zeros((capacity, 0, 2))
+        self._handles: np.ndarray = np.zeros((capacity, 0), dtype=np.int64)
+        self._counts: np.ndarray = np.zeros(capacity, dtype=np.intp)
+        self._reserve(max_bodies)
+
+        # Steps are numbered from 0 when the history is made. Only steps in
+        # [oldest, newest] are still in the buffer.
+        self.oldest: int = 0
+        self.newest: int = -1
+
+    @classmethod
+    def from_seconds(
+        cls, physics: Physics, seconds: float, max_bodies: int = 64
+    ) -> RewindHistory:
+        return cls(physics, ceil(seconds / physics.fixed_clock.rate), max_bodies)
+
+    def __len__(self) -> int:
+        return self.newest - self.oldest + 1
+
+    def __contains__(self, step: int) -> bool:
+        return self.oldest <= step <= self.newest
+
+    def _reserve(self, max_bodies: int):
+        # Growing copies every recorded step, but only happens when the world
+        # gets more bodies than it has ever had before.
+        if max_bodies <= self.max_bodies:
+            return
+        for name in ("_positions", "_velocities", "_handles"):
+            old = getattr(self, name)
+            new = np.zeros((self.capacity, max_bodies) + old.shape[2:], dtype=old.dtype)
+            new[:, : self.max_bodies] = old
+            setattr(self, name, new)
+        self.max_bodies = max_bodies
+
+    def clear(self):
+        self.oldest = 0
+        self.newest = -1
+
+    def record(self) -> int:
+        """
+        Store the physics world's current state as the next step.
+
+        :return: the step number it was stored as.
+        """
+        count = len(self._physics)
+        if count > self.max_bodies:
+            self._reserve(max(count, 2 * self.max_bodies))
+
+        self.newest += 1
+        if self.newest - self.oldest >= self.capacity:
+            self.oldest += 1
+
+        slot = self.newest % self.capacity
+        self._counts[slot] = self._physics.capture(
+            self._positions[slot], self._velocities[slot], self._handles[slot]
+        )
+        return self.newest
+
+    def seek(self, step: int) -> bool:
+        """
+        Put the physics world back into the state it was in at a recorded step.
+
+        Bodies added since are left alone, and bodies removed since are skipped.
+
+        :return: whether the step was still recorded.
+        """
+        if step not in self:
+            return False
+        slot = step % self.capacity
+        count = self._counts[slot]
+        self._physics.restore(
+            self._positions[slot, :count],
+            self._velocities[slot, :count],
+            self._handles[slot, :count],
+        )
+        return True
+
+    def rewind(self, steps: int = 1) -> bool:
+        """
+        Go back a number of steps and forget everything after them, so recording continues from there.
+
+        :return: whether there was any history left to rewind to.
+        """
+        step = max(self.oldest, self.newest - steps)
+        if step == self.newest or not self.seek(step):
+            return False
+        self.newest = step
+        return True
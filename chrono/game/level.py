@@ -0,0 +1,388 @@
+"""
+Level files, run as `python -m chrono.game.level <name>...` to compile levels to binary
+
+A level is written by hand as `resources/data/<name>.toml` and compiled to
+`resources/data/<name>.lvl`, which is what ships. Both hold the same thing:
+a table of names, then one flat array each for terrain, platforms and
+triggers. The binary form is those arrays' raw bytes behind a small header,
+so loading it is a read and a few zero copy numpy views, no matter how big
+the level is. Sprites are only made from the arrays once the level is
+actually played.
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+import struct
+import tomllib
+
+import numpy as np
+from arcade import Sprite, Texture, Vec2
+
+from chrono.game.tracks import PATHS, Tracks
+from resources import get_data_path, get_level_path, load_texture
+
+LEVEL_MAGIC = b"CLVL"
+LEVEL_VERSION = 2
+# magic, version, width, height, player x, player y, goal x, goal y, then the bytes
+# of the name table and the number of terrain, platforms, triggers and path points
+HEADER = struct.Struct("<4sH6f5I")
+
+# Every name, texture and target is an index into the level's name table
+TERRAIN = np.dtype(
+    [
+        ("name", "<u2"),
+        ("texture", "<u2"),
+        ("position", "<f4", (2,)),
+        ("size", "<f4", (2,)),
+    ]
+)
+# A sine platform swings about a out to b and as far the other way, a linear one
+# goes back and forth between a and b at a constant speed, and a circle platform
+# orbits a with radii b. A piecewise platform loops through its `count` path
+# points starting at `first`.
+PLATFORM = np.dtype(
+    [
+        ("name", "<u2"),
+        ("texture", "<u2"),
+        ("size", "<f4", (2,)),
+        ("path", "u1"),
+        ("a", "<f4", (2,)),
+        ("b", "<f4", (2,)),
+        ("period", "<f4"),
+        ("phase", "<f4"),
+        ("first", "<u4"),
+        ("count", "<u4"),
+    ]
+)
+POINT = np.dtype([("position", "<f4", (2,))])
+# Touching a trigger puts its target in the level until time rewinds past every touch of it
+TRIGGER = np.dtype(
+    [
+        ("name", "<u2"),
+        ("texture", "<u2"),
+        ("position", "<f4", (2,)),
+        ("size", "<f4", (2,)),
+        ("colour", "u1", (4,)),
+        ("target", "<u2"),
+    ]
+)
+
+
+class LevelError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class Level:
+    names: list[str]
+    size: tuple[float, float]
+    player: tuple[float, float]  # Where the player starts
+    goal: tuple[float, float]
+    terrain: np.ndarray
+    platforms: np.ndarray
+    triggers: np.ndarray
+    points: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=POINT))
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.terrain.nbytes
+            + self.platforms.nbytes
+            + self.triggers.nbytes
+            + self.points.nbytes
+        )
+
+    # -- TOML --
+
+    @classmethod
+    def from_toml(cls, text: str) -> Level:
+        source = tomllib.loads(text)
+        names: dict[str, int] = {}
+
+        def name(value: str) -> int:
+            return names.setdefault(value, len(names))
+
+        points: list[list[float]] = []
+
+        def path(platform: dict) -> tuple:
+            first = len(points)
+            if platform["path"] == "piecewise":
+                if len(platform["points"]) < 2:
+                    raise ValueError("A piecewise path needs at least two points")
+                points.extend(platform["points"])
+                a = b = (0.0, 0.0)
+            else:
+                a, b = platform["a"], platform["b"]
+            return PATHS.index(platform["path"]), a, b, first, len(points) - first
+
+        try:
+            terrain = [
+                (
+                    name(block.get("name", "")),
+                    name(block["texture"]),
+                    block["position"],
+                    block["size"],
+                )
+                for block in source.get("terrain", ())
+            ]
+            platforms = []
+            for platform in source.get("platform", ()):
+                kind, a, b, first, count = path(platform)
+                platforms.append(
+                    (
+                        name(platform.get("name", "")),
+                        name(platform["texture"]),
+                        platform["size"],
+                        kind,
+                        a,
+                        b,
+                        platform["period"],
+                        platform.get("phase", 0.0),
+                        first,
+                        count,
+                    )
+                )
+            triggers = [
+                (
+                    name(trigger.get("name", "")),
+                    name(trigger["texture"]),
+                    trigger["position"],
+                    trigger["size"],
+                    trigger.get("colour", (255, 255, 255, 255)),
+                    name(trigger["target"]),
+                )
+                for trigger in source.get("trigger", ())
+            ]
+            level = cls(
+                list(names),
+                tuple(source["size"]),
+                tuple(source["player"]),
+                tuple(source["goal"]),
+                np.array(terrain, dtype=TERRAIN),
+                np.array(platforms, dtype=PLATFORM),
+                np.array(triggers, dtype=TRIGGER),
+                np.array([(point,) for point in points], dtype=POINT),
+            )
+        except (KeyError, ValueError) as e:
+            raise LevelError(f"Invalid level: {e!r}") from e
+        level._check_paths()
+        level._check_targets()
+        return level
+
+    def to_toml(self) -> str:
+        names = self.names
+
+        def vector(values) -> str:
+            return f"[{', '.join(str(value) for value in values)}]"
+
+        lines = [
+            f"size = {vector(np.float32(self.size))}",
+            f"player = {vector(np.float32(self.player))}",
+            f"goal = {vector(np.float32(self.goal))}",
+        ]
+        for block in self.terrain:
+            lines += (
+                "",
+                "[[terrain]]",
+                f'name = "{names[block["name"]]}"',
+                f'texture = "{names[block["texture"]]}"',
+                f"position = {vector(block['position'])}",
+                f"size = {vector(block['size'])}",
+            )
+        for platform in self.platforms:
+            lines += (
+                "",
+                "[[platform]]",
+                f'name = "{names[platform["name"]]}"',
+                f'texture = "{names[platform["texture"]]}"',
+                f"size = {vector(platform['size'])}",
+                f'path = "{PATHS[platform["path"]]}"',
+            )
+            if PATHS[platform["path"]] == "piecewise":
+                first, count = platform["first"], platform["count"]
+                path = self.points["position"][first : first + count]
+                lines.append(f"points = [{', '.join(vector(point) for point in path)}]")
+            else:
+                lines += (
+                    f"a = {vector(platform['a'])}",
+                    f"b = {vector(platform['b'])}",
+                )
+            lines += (
+                f"period = {platform['period']}",
+                f"phase = {platform['phase']}",
+            )
+        for trigger in self.triggers:
+            lines += (
+                "",
+                "[[trigger]]",
+                f'name = "{names[trigger["name"]]}"',
+                f'texture = "{names[trigger["texture"]]}"',
+                f"position = {vector(trigger['position'])}",
+                f"size = {vector(trigger['size'])}",
+                f"colour = {vector(trigger['colour'])}",
+                f'target = "{names[trigger["target"]]}"',
+            )
+        return "\n".join(lines) + "\n"
+
+    # -- Binary --
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Level:
+        """Read a compiled level. The arrays are read only views straight into data."""
+        if len(data) < HEADER.size:
+            raise LevelError("Invalid level: too short for the header")
+        magic, version, *values = HEADER.unpack_from(data)
+        if magic != LEVEL_MAGIC:
+            raise LevelError(f"Invalid level: not a level file, starts with {magic!r}")
+        if version != LEVEL_VERSION:
+            raise LevelError(
+                f"Invalid level: version {version}, only {LEVEL_VERSION} is supported"
+            )
+        width, height, px, py, gx, gy, names_size, *counts = values
+
+        offset = HEADER.size + names_size
+        names = data[HEADER.size : offset].decode("utf-8").split("\0")
+        arrays = []
+        for dtype, count in zip((TERRAIN, PLATFORM, TRIGGER, POINT), counts):
+            if offset + count * dtype.itemsize > len(data):
+                raise LevelError("Invalid level: the file is truncated")
+            arrays.append(np.frombuffer(data, dtype, count, offset))
+            offset += count * dtype.itemsize
+
+        level = cls(names, (width, height), (px, py), (gx, gy), *arrays)
+        level._check_paths()
+        level._check_targets()
+        return level
+
+    def to_bytes(self) -> bytes:
+        names = "\0".join(self.names).encode("utf-8")
+        header = HEADER.pack(
+            LEVEL_MAGIC,
+            LEVEL_VERSION,
+            *self.size,
+            *self.player,
+            *self.goal,
+            len(names),
+            len(self.terrain),
+            len(self.platforms),
+            len(self.triggers),
+            len(self.points),
+        )
+        return b"".join(
+            (
+                header,
+                names,
+                self.terrain.tobytes(),
+                self.platforms.tobytes(),
+                self.triggers.tobytes(),
+                self.points.tobytes(),
+            )
+        )
+
+    def _check_paths(self):
+        ends = self.platforms["first"].astype(np.int64) + self.platforms["count"]
+        if len(ends) and ends.max() > len(self.points):
+            raise LevelError("Invalid level: a platform's path runs past the path points")
+        piecewise = self.platforms["path"] == PATHS.index("piecewise")
+        if np.any(self.platforms["count"][piecewise] < 2):
+            raise LevelError("Invalid level: a piecewise path needs at least two points")
+
+    def _check_targets(self):
+        named = np.concatenate((self.terrain["name"], self.platforms["name"]))
+        missing = self.triggers["target"][~np.isin(self.triggers["target"], named)]
+        if len(missing):
+            raise LevelError(
+                f"Invalid level: trigger target {self.names[missing[0]]!r} doesn't exist"
+            )
+
+
+def load_level(name: str) -> Level:
+    """
+    Load a level from resources/data.
+
+    :param name: the level's file name without the extension.
+    :return: the compiled level, unless its toml has been edited since it was compiled.
+    """
+    binary, text = get_level_path(name), get_data_path(name)
+    if binary.exists() and (
+        not text.exists() or binary.stat().st_mtime >= text.stat().st_mtime
+    ):
+        return Level.from_bytes(binary.read_bytes())
+    return Level.from_toml(text.read_text("utf-8"))
+
+
+def compile_level(name: str):
+    """Write a level's toml out as its binary form, next to it in resources/data."""
+    level = Level.from_toml(get_data_path(name).read_text("utf-8"))
+    get_level_path(name).write_bytes(level.to_bytes())
+
+
+class LevelSprites:
+    # The sprites for everything in a level.
+    # Textures are loaded once per name and shared, so repeated tiles cost
+    # one atlas entry. Anything given a name in the level can be looked up
+    # with `named`. Only the terrain rows given are made up front, the rest
+    # can be made later with `blocks`, the targets of triggers always are.
+
+    def __init__(self, level: Level, terrain: np.ndarray | None = None) -> None:
+        self.level: Level = level
+        self._textures: dict[int, Texture] = {}
+        self.named: dict[str, Sprite] = {}
+
+        if terrain is None:
+            terrain = np.arange(len(level.terrain))
+        else:
+            targeted = np.isin(level.terrain["name"], level.triggers["target"])
+            terrain = np.union1d(terrain, np.flatnonzero(targeted))
+        self.terrain: list[Sprite] = self.blocks(terrain)
+        self.platforms: list[Sprite] = [
+            self._sprite(platform["name"], platform["texture"], platform["size"], position)
+            for platform, position in zip(
+                level.platforms, Tracks(level.platforms, level.points).evaluate(0.0)[0]
+            )
+        ]
+        self.triggers: list[Sprite] = []
+        for trigger in level.triggers:
+            sprite = self._sprite(
+                trigger["name"], trigger["texture"], trigger["size"], trigger["position"]
+            )
+            sprite.color = tuple(trigger["colour"].tolist())
+            self.triggers.append(sprite)
+        # What each trigger takes out of the level
+        self.targets: list[Sprite] = [
+            self.named[level.names[target]] for target in level.triggers["target"]
+        ]
+
+    def texture(self, texture: int) -> Texture:
+        if texture not in self._textures:
+            self._textures[texture] = load_texture(self.level.names[texture])
+        return self._textures[texture]
+
+    def blocks(self, rows: np.ndarray) -> list[Sprite]:
+        """Make the sprites for some rows of the level's terrain."""
+        return [
+            self._sprite(block["name"], block["texture"], block["size"], block["position"])
+            for block in self.level.terrain[rows]
+        ]
+
+    def _sprite(self, name: int, texture: int, size: np.ndarray, position) -> Sprite:
+        sprite = Sprite(self.texture(texture))
+        sprite.size = tuple(size.tolist())
+        sprite.position = tuple(np.asarray(position).tolist())
+        sprite.velocity = Vec2()
+        if self.level.names[name]:
+            self.named[self.level.names[name]] = sprite
+        return sprite
+
+
+def main():
+    parser = ArgumentParser(prog="python -m chrono.game.level")
+    parser.add_argument("names", nargs="+", help="levels in resources/data to compile")
+    for name in parser.parse_args().names:
+        compile_level(name)
+        print(f"compiled {get_level_path(name)}")
+
+
+if __name__ == "__main__":
+    main()
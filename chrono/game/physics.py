@@ -1,13 +1,19 @@
 from __future__ import annotations
-from uuid import uuid4, UUID
 from dataclasses import dataclass
+from typing import Callable, TYPE_CHECKING
 
+import numpy as np
 from arcade import Vec2, XYWH
-from arcade.clock import Clock, GLOBAL_FIXED_CLOCK
+from arcade.clock import Clock, FixedClock, GLOBAL_FIXED_CLOCK
 from arcade.types import Point2, Rect
 
+from chrono.game.broadphase import SweepAndPrune
+from chrono.game.physics_stats import RESIDUAL_INTERVAL, PhysicsStats
+from chrono.game.swept import is_fast, time_of_impact
+from chrono.game.slotmap import SlotMap
 
-PHYSICS_CLOCK = Clock()
+if TYPE_CHECKING:
+    from chrono.game.physics_array import BodyArrays
 
 
 @dataclass(slots=True, eq=True)
@@ -26,7 +32,8 @@ class Body:
         "size",
         "mass",
         "static",
-        "UUID",
+        "island",
+        "handle",
     )
 
     def __init__(
@@ -43,8 +50,10 @@ class Body:
         self.size = size
         self.mass = mass
         self.static = static
-        # Probably not needed as we could just use ID, but I wanna do this anyway nya~
-        self.UUID: UUID = uuid4()
+        self.island: BodyGroup | None = None  # Only set while the body is asleep
+        # Given out by the Physics the body is added to, -1 while it isn't in one.
+        # Bodies hash by identity, which is far cheaper than hashing a UUID every lookup
+        self.handle: int = -1
 
     @property
     def bounds(self) -> Rect:
@@ -52,17 +61,14 @@ class Body:
         w, h = self.size
         return XYWH(x, y, w, h)
 
-    def __eq__(self, value) -> bool:
-        if type(value) is not Body:  # Not inheretence safe but eh
-            raise NotImplementedError
-        return self.UUID == value.UUID
-
-    def __hash__(self) -> int:
-        return hash(self.UUID)
+    def wake(self):
+        if self.island is not None:
+            self.island.wake()
 
     def apply_force(self, force: Vec2):
         if self.static:
             return
+        self.wake()
         acceleration = force / self.mass
         self.apply_acceleration(acceleration)
 
@@ -74,23 +80,42 @@ class Body:
     def apply_impulse(self, momentum: Vec2):
         if self.static:
             return
+        self.wake()
         self.velocity += momentum / self.mass
 
 
 class BodyGroup:
     # We store groups of bodies that are currently all connecting (ending with static bodies)
+    # Only sleeping islands are kept around, so touching any body in one wakes all of it
 
-    def __init__(self) -> None:
-        self.bodies: list[Body]
+    def __init__(
+        self, bodies: list[Body], on_wake: Callable[[BodyGroup], None] | None = None
+    ) -> None:
+        self.bodies: list[Body] = bodies
+        self._on_wake: Callable[[BodyGroup], None] | None = on_wake
 
     def __eq__(self, other: object) -> bool:
-        if type[other] is BodyGroup:
+        if type(other) is BodyGroup:
             return self.bodies == other.bodies  # type: ignore - it is a BodyGroup
         raise NotImplementedError
 
     def __hash__(self) -> int:
         return hash(tuple(self.bodies))
 
+    def sleep(self):
+        for body in self.bodies:
+            body.velocity = Vec2()
+            body.acceleration = Vec2()
+            body.island = self
+
+    def wake(self):
+        if self.bodies[0].island is not self:
+            return  # Already awake
+        for body in self.bodies:
+            body.island = None
+        if self._on_wake is not None:
+            self._on_wake(self)
+
 
 class Constraint:
     # A contraint on one or more bodies.
@@ -107,6 +132,12 @@ class Constraint:
         # If another constraint of the same type forms with the same bodies we want to use the already exsisiting constraint for warm starts
         return hash((type(self), self.bodies))
 
+    def pre_step(self, dt: float):
+        # Called once a fixed update before warm starting. Anything that only
+        # depends on positions should be worked out here, as positions don't
+        # change while iterating, so each iteration is only a dot product and clamp
+        pass
+
     def compute_impulse(self) -> float:
         raise NotImplementedError()
 
@@ -114,7 +145,10 @@ class Constraint:
         raise NotImplementedError()
 
     def warm_start(self):
-        pass
+        # Re-apply the impulse the constraint ended last step with, so the
+        # iterations start close to the answer rather than from nothing
+        if self.impulse:
+            self.apply_impulse(self.impulse)
 
     def iterate(self):
         delta = self.compute_impulse()
@@ -142,7 +176,14 @@ class StaticBounds(InequalityConstraint):
         super().__init__(bodies)
         self.bounds = bounds
 
-    def compute_impulse(self) -> float:
+        # Cached by pre_step, positions don't change while iterating
+        self.touching: bool = False
+        self.normal: Vec2 = Vec2()
+        self.depth: float = 0.0
+        self.bias: float = 0.0
+        self.mass: float = 0.0
+
+    def pre_step(self, dt: float):
         bx, by = self.bounds.center
         x, y = self.bodies.position
         diff_x = 2.0 * (x - bx) / self.bounds.width
@@ -152,8 +193,9 @@ class StaticBounds(InequalityConstraint):
         abs_y = abs(diff_y)
         sub_y = abs(y - by) + (self.bodies.size[1] - self.bounds.height) / 2.0
 
-        if sub_x <= 0 and sub_y <= 0:
-            return 0.0
+        self.touching = sub_x > 0 or sub_y > 0
+        if not self.touching:
+            return
 
         if diff_y >= abs_x:
             normal = Vec2(0.0, -1.0)
@@ -170,30 +212,26 @@ class StaticBounds(InequalityConstraint):
         else:
             raise ValueError
 
-        impulse = -self.bodies.velocity.dot(normal)
-        bias = BOUNDS_BIAS / PHYSICS_CLOCK.dt * max(0.0, depth - BOUNDS_SLOP)
+        self.normal = normal
+        self.depth = depth
+        self.bias = BOUNDS_BIAS / dt * max(0.0, depth - BOUNDS_SLOP)
+        self.mass = self.bodies.mass
 
-        return (impulse + bias) * self.bodies.mass
+    def compute_impulse(self) -> float:
+        if not self.touching:
+            return 0.0
+        impulse = -self.bodies.velocity.dot(self.normal)
+        return (impulse + self.bias) * self.mass
 
     def apply_impulse(self, impulse: float):
-        bx, by = self.bounds.center
-        x, y = self.bodies.position
-        diff_x = 2.0 * (x - bx) / self.bounds.width
-        abs_x = abs(diff_x)
-        diff_y = 2.0 * (y - by) / self.bounds.height
-        abs_y = abs(diff_y)
-        if diff_y >= abs_x:
-            normal = Vec2(0.0, -1.0)
-        elif -diff_y >= abs_x:
-            normal = Vec2(0.0, 1.0)
-        elif diff_x > abs_y:
-            normal = Vec2(-1.0, 0.0)
-        elif -diff_x > abs_y:
-            normal = Vec2(1.0, 0.0)
-        else:
-            raise ValueError
+        self.bodies.apply_impulse(impulse * self.normal)
 
-        self.bodies.apply_impulse(impulse * normal)
+    def warm_start(self):
+        if not self.touching:
+            # No longer touching the edges so last step's push doesn't apply
+            self.impulse = 0.0
+            return
+        super().warm_start()
 
 
 COLLISION_BIAS = 0.2  # percentage [0.1-0.3] recommended
@@ -201,23 +239,65 @@ COLLISION_SLOP = 2  # 'Allowed' Intersection in pixels
 
 
 class CollisionConstraint(InequalityConstraint):
+    # Keeps two non-rotating boxes from overlapping. The normal points from a to b
 
     def __init__(self, bodies: tuple[Body, Body]):
         super().__init__(bodies)
         self.a, self.b = bodies
+
+        # Cached by pre_step, positions don't change while iterating
+        self.normal: Vec2 = Vec2()
+        self.depth: float = 0.0
+        self.bias: float = 0.0
+        self.mass: float = 0.0  # The effective mass along the normal
+
+    def pre_step(self, dt: float):
         ax, ay = self.a.position
         aw, ah = self.a.size
         bx, by = self.b.position
         bw, bh = self.b.size
 
-        diff_x = 2.0 * (bx - ax) / aw
-        diff_y = 2.0 * (by - ay) / ah
+        # Compare against the combined size so the normal is the axis of least overlap
+        diff_x = 2.0 * (bx - ax) / (aw + bw)
+        diff_y = 2.0 * (by - ay) / (ah + bh)
+
+        if diff_y >= abs(diff_x):
+            normal, depth = Vec2(0.0, 1.0), 0.5 * (ah + bh) - (by - ay)
+        elif -diff_y >= abs(diff_x):
+            normal, depth = Vec2(0.0, -1.0), 0.5 * (ah + bh) + (by - ay)
+        elif diff_x > abs(diff_y):
+            normal, depth = Vec2(1.0, 0.0), 0.5 * (aw + bw) - (bx - ax)
+        elif -diff_x > abs(diff_y):
+            normal, depth = Vec2(-1.0, 0.0), 0.5 * (aw + bw) + (bx - ax)
+        else:
+            # Perfectly overlapping centres, just push b up
+            normal, depth = Vec2(0.0, 1.0), 0.5 * (ah + bh)
+
+        inv_a = 0.0 if self.a.static else 1.0 / self.a.mass
+        inv_b = 0.0 if self.b.static else 1.0 / self.b.mass
+        inverse_mass = inv_a + inv_b
+
+        self.normal = normal
+        self.depth = depth
+        self.bias = COLLISION_BIAS / dt * max(0.0, depth - COLLISION_SLOP)
+        # Zero mass means the contact can't do anything, either they don't overlap or both are static
+        self.mass = 0.0 if depth <= 0.0 or inverse_mass == 0.0 else 1.0 / inverse_mass
 
     def compute_impulse(self) -> float:
-        pass
+        if not self.mass:
+            return 0.0
+        impulse = -(self.b.velocity - self.a.velocity).dot(self.normal)
+        return (impulse + self.bias) * self.mass
 
     def apply_impulse(self, impulse: float):
-        pass
+        self.a.apply_impulse(-impulse * self.normal)
+        self.b.apply_impulse(impulse * self.normal)
+
+    def warm_start(self):
+        if not self.mass:
+            self.impulse = 0.0
+            return
+        super().warm_start()
 
 
 class Force:
@@ -225,24 +305,62 @@ class Force:
     # It works on a list of Bodies which can change frame to frame
     # This is things such as boyancy, gravity etc.
 
+    # Most forces skip sleeping bodies, otherwise gravity would never let
+    # anything sleep. Forces which are driven from outside, like a spring
+    # following the mouse, wake their bodies and keep them awake instead.
+    keeps_awake: bool = False
+
     def __init__(self, bodies: list[Body]) -> None:
-        self.bodies: list[Body] = bodies
+        # An insertion ordered set so checking membership doesn't scan every body
+        self.bodies: dict[Body, None] = dict.fromkeys(bodies)
+        # Bumped whenever the bodies change so batched index arrays can be cached
+        self.version: int = 0
 
     def add_body(self, body: Body):
         if body in self.bodies:
             return
-        self.bodies.append(body)
+        self.bodies[body] = None
+        self.version += 1
 
     def remove_body(self, body: Body):
         if body not in self.bodies:
             return
-        self.bodies.remove(body)
+        del self.bodies[body]
+        self.version += 1
 
     def process(self):
         # A force can remove a body for any reason so we need to iteracte over
-        for body in self.bodies[:]:
+        for body in list(self.bodies):
+            if body.island is not None:
+                if not self.keeps_awake:
+                    continue
+                body.wake()
             self._iteration(body)
 
+    def process_batch(self, indices: np.ndarray, arrays: BodyArrays):
+        # Apply the force to the rows `indices` of `arrays` in one vectorised
+        # pass, adding into the shared acceleration array. The indices only
+        # ever contain awake, non static bodies.
+        raise NotImplementedError
+
+    @classmethod
+    def process_group(
+        cls,
+        forces: list[Force],
+        owners: np.ndarray,
+        indices: np.ndarray,
+        arrays: BodyArrays,
+    ):
+        # Apply every force of this type in a world at once. `owners` says
+        # which of `forces` each row of `indices` belongs to, and is sorted.
+        # By default each force is batched on its own, which is plenty when
+        # there are only a few. Forces that are often made one per body, like
+        # springs, override this so they aren't a numpy call per body.
+        bounds = np.searchsorted(owners, np.arange(len(forces) + 1)).tolist()
+        for force, start, stop in zip(forces, bounds, bounds[1:]):
+            if start < stop:
+                force.process_batch(indices[start:stop], arrays)
+
     def _iteration(self, body: Body):
         raise NotImplementedError
 
@@ -260,6 +378,9 @@ class StaticGravity(Force):
     def _iteration(self, body: Body):
         body.apply_acceleration(self._pull)
 
+    def process_batch(self, indices: np.ndarray, arrays: BodyArrays):
+        arrays.acceleration[indices] += self._pull
+
 
 class StaticDrag(Force):
     # Assuming everything has the same area and drag coeffcient
@@ -277,9 +398,17 @@ class StaticDrag(Force):
         speed = body.velocity.length_squared()
         body.apply_force(0.5 * speed * self.drag * -direction)
 
+    def process_batch(self, indices: np.ndarray, arrays: BodyArrays):
+        # |v|^2 * -v/|v| is just -|v| * v, which also copes with bodies at rest
+        velocity = arrays.velocity[indices]
+        speed = np.sqrt(np.einsum("ij,ij->i", velocity, velocity))
+        scale = -0.5 * self.drag * speed / arrays.mass[indices]
+        arrays.acceleration[indices] += scale[:, None] * velocity
+
 
 class Spring(Force):
     # Apply a force proportional to the spring's extension
+    keeps_awake = True
 
     def __init__(
         self, bodies: list[Body], source: Vec2, tension: float, length: float
@@ -295,48 +424,236 @@ class Spring(Force):
         direction = diff / length
         body.apply_acceleration(self.tension * (self.length - length) * direction)
 
+    def process_batch(self, indices: np.ndarray, arrays: BodyArrays):
+        diff = arrays.position[indices] - self.source
+        length = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        # A body sitting exactly on the source has no direction to be pulled in
+        scale = np.divide(
+            self.tension * (self.length - length),
+            length,
+            out=np.zeros_like(length),
+            where=length > 0.0,
+        )
+        arrays.acceleration[indices] += scale[:, None] * diff
+
+    @classmethod
+    def process_group(
+        cls,
+        forces: list[Spring],
+        owners: np.ndarray,
+        indices: np.ndarray,
+        arrays: BodyArrays,
+    ):
+        # Every spring's source, tension and length is spread out to its rows
+        source = np.array([(f.source[0], f.source[1]) for f in forces])[owners]
+        tension = np.array([f.tension for f in forces])[owners]
+        rest = np.array([f.length for f in forces])[owners]
+
+        diff = arrays.position[indices] - source
+        length = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        scale = np.divide(
+            tension * (rest - length),
+            length,
+            out=np.zeros_like(length),
+            where=length > 0.0,
+        )
+        # A body can hang from more than one spring, so the adds must accumulate
+        np.add.at(arrays.acceleration, indices, scale[:, None] * diff)
+
+
+CONTACT_LIFETIME = 4  # How many steps a contact is kept after its bodies stop overlapping
+
 
 class Arbitrator:
     # The arbitrator is used to keep track of collision pairs that are ongoing
     # We use this to get warm starting on our contraints
-    pass
+
+    def __init__(self) -> None:
+        self._contacts: dict[tuple[Body, Body], CollisionConstraint] = {}
+        self._last_active: dict[tuple[Body, Body], int] = {}
+        self._by_body: dict[Body, set[tuple[Body, Body]]] = {}
+        self._step: int = 0
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    def update(self, pairs: list[tuple[Body, Body]]) -> list[CollisionConstraint]:
+        """
+        Match this step's overlapping pairs against the contacts from previous steps.
+
+        Pairs which were already in contact reuse their constraint, and so the impulse
+        it had built up. Contacts that haven't been active for CONTACT_LIFETIME steps are dropped.
+
+        :param pairs: the overlapping pairs found by the broadphase, ordered consistently.
+        :return: the contacts active this step.
+        """
+        self._step += 1
+        step = self._step
+
+        active: list[CollisionConstraint] = []
+        for pair in pairs:
+            contact = self._contacts.get(pair)
+            if contact is None:
+                contact = self._contacts[pair] = CollisionConstraint(pair)
+                a, b = pair
+                self._by_body.setdefault(a, set()).add(pair)
+                self._by_body.setdefault(b, set()).add(pair)
+            self._last_active[pair] = step
+            active.append(contact)
+
+        if len(self._contacts) > len(active):
+            stale = [
+                pair
+                for pair, last in self._last_active.items()
+                if step - last > CONTACT_LIFETIME
+            ]
+            for pair in stale:
+                self._drop(pair)
+
+        return active
+
+    def _drop(self, pair: tuple[Body, Body]):
+        del self._contacts[pair]
+        del self._last_active[pair]
+        for body in pair:
+            pairs = self._by_body[body]
+            pairs.discard(pair)
+            if not pairs:
+                del self._by_body[body]
+
+    def remove_body(self, body: Body):
+        for pair in list(self._by_body.get(body, ())):
+            self._drop(pair)
+
+    def clear(self):
+        self._contacts.clear()
+        self._last_active.clear()
+        self._by_body.clear()
 
 
 # We actually break the No.1 rule of physics engines, keep the dt stable
 # but we only reverse it so it should be fine???
-ITERATION_NUMBER = 5
+# Warm starting means 3 iterations hold a stack better than 5 did without it
+ITERATION_NUMBER = 3  # Default for Physics.iterations
+
+# An island falls asleep once its kinetic energy per unit mass has stayed
+# under SLEEP_ENERGY for SLEEP_STEPS fixed updates in a row
+SLEEP_ENERGY = 0.5 * 4.0**2  # Equivalent to every body moving at 4 pixels per second
+SLEEP_STEPS = 30
 
 
 class Physics:
 
-    def __init__(self) -> None:
-        self._bodies: list[Body] = []
+    def __init__(self, fixed_clock: FixedClock = GLOBAL_FIXED_CLOCK) -> None:
+        # Each world keeps its own time so many can run side by side. It steps
+        # by the fixed clock's dt and interpolates by its fraction.
+        self.fixed_clock: FixedClock = fixed_clock
+        self.clock: Clock = Clock()
+        self.iterations: int = ITERATION_NUMBER
+        self.stats: PhysicsStats | None = None  # Only recorded once enabled
+
+        self._bodies: SlotMap[Body] = SlotMap()
+        self._awake_bodies: dict[Body, None] = {}  # Insertion ordered set
         self._sleeping_bodies: set[Body] = set()
+        self._rest_steps: dict[Body, int] = {}
         self._last_states: dict[Body, StepState] = {}
         self._current_states: dict[Body, StepState] = {}
 
         self._constraints: list[Constraint] = []
+        self._active_constraints: list[Constraint] = []
         self._forces: list[Force] = []
 
+        self._broadphase: SweepAndPrune = SweepAndPrune()
+        self._arbitrator: Arbitrator = Arbitrator()
+        self._contacts: list[CollisionConstraint] = []
+
     def __getitem__(self, item: Body) -> StepState:
         return self._current_states[item]
 
-    def add_body(self, body: Body):
-        if body in self._bodies:
-            return
-        self._bodies.append(body)
-        state = StepState(body.position, body.velocity)
-        self._last_states[body] = self._current_states[body] = state
+    def __contains__(self, item: Body) -> bool:
+        # The handle could be from another world so check it's really this body
+        handle = item.handle
+        return handle in self._bodies and self._bodies[handle] is item
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    @property
+    def awake_count(self) -> int:
+        return len(self._awake_bodies)
+
+    def close(self):
+        """Give back anything held outside python, a plain world holds nothing."""
+
+    def __enter__(self) -> Physics:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def enable_stats(
+        self, window: int = 120, residual_interval: int = RESIDUAL_INTERVAL
+    ) -> PhysicsStats:
+        """Start timing every phase of fixed_update, keeping the last `window` steps."""
+        if self.stats is None:
+            self.stats = PhysicsStats(self, window, residual_interval)
+            self.stats.attach()
+        return self.stats
+
+    def disable_stats(self):
+        if self.stats is not None:
+            self.stats.detach()
+            self.stats = None
+
+    def residual(self) -> float:
+        """The largest impulse another solver iteration would still apply, zero when every constraint is satisfied."""
+        worst = 0.0
+        for constraint in self._active_constraints + self._contacts:
+            delta = constraint.compute_impulse()
+            if isinstance(constraint, InequalityConstraint):
+                delta = max(0.0, constraint.impulse + delta) - constraint.impulse
+            worst = max(worst, abs(delta))
+        return worst
+
+    def get_body(self, handle: int) -> Body | None:
+        if handle not in self._bodies:
+            return None
+        return self._bodies[handle]
+
+    def _track(self, body: Body):
+        self._broadphase.add(body)
+        self._awake_bodies[body] = None
+        self._rest_steps[body] = 0
+
+    def _forget(self, body: Body):
+        body.wake()
+        self._broadphase.remove(body)
+        self._arbitrator.remove_body(body)
+        self._awake_bodies.pop(body, None)
+        self._rest_steps.pop(body, None)
+
+    def add_body(self, body: Body) -> Body:
+        if body in self:
+            return body
+        body.handle = self._bodies.insert(body)
+        # Both states are kept for the body's lifetime and updated in place
+        self._last_states[body] = StepState(body.position, body.velocity)
+        self._current_states[body] = StepState(body.position, body.velocity)
+        self._track(body)
+        return body
 
     def remove_body(self, body: Body):
-        if body not in self._bodies:
+        if body not in self:
             return
-        self._bodies.remove(body)
+        self._forget(body)
+        self._bodies.remove(body.handle)
+        body.handle = -1
         del self._last_states[body]
         del self._current_states[body]
 
     def extend_bodies(self, bodies: list[Body]):
-        self._bodies.extend(body for body in bodies if body not in self._bodies)
+        for body in bodies:
+            self.add_body(body)
 
     def add_force(self, force: Force):
         if force in self._forces:
@@ -358,48 +675,288 @@ class Physics:
             return
         self._constraints.remove(constraint)
 
+    def capture(
+        self, positions: np.ndarray, velocities: np.ndarray, handles: np.ndarray
+    ) -> int:
+        """
+        Copy the state of every body into arrays, such as a row of a RewindHistory.
+
+        :param positions: at least len(self) by 2 array to fill.
+        :param velocities: at least len(self) by 2 array to fill.
+        :param handles: at least len(self) array to fill with the handle of each row's body.
+        :return: the number of rows filled.
+        """
+        for idx, body in enumerate(self._bodies):
+            positions[idx] = body.position[0], body.position[1]
+            velocities[idx] = body.velocity[0], body.velocity[1]
+            handles[idx] = body.handle
+        return len(self._bodies)
+
+    def restore(
+        self, positions: np.ndarray, velocities: np.ndarray, handles: np.ndarray
+    ):
+        """Put bodies back into a state filled in by `capture`. Bodies that have since been removed are skipped."""
+        for position, velocity, handle in zip(
+            positions.tolist(), velocities.tolist(), handles.tolist()
+        ):
+            body = self.get_body(handle)
+            if body is None:
+                continue
+            body.position, body.velocity = Vec2(*position), Vec2(*velocity)
+        self._after_restore()
+
+    def _after_restore(self):
+        # Jumping to another state invalidates everything carried between
+        # steps, so wake everything up and forget contact impulses
+        for body in list(self._sleeping_bodies):
+            body.wake()
+        self._arbitrator.clear()
+        for body in self._bodies:
+            self._rest_steps[body] = 0
+        # No interpolating across the jump either
+        self._rest_states(list(self._bodies))
+
+    def _sleep_island(self, bodies: list[Body]):
+        group = BodyGroup(bodies, self._wake_island)
+        group.sleep()
+        for body in bodies:
+            del self._awake_bodies[body]
+            self._sleeping_bodies.add(body)
+        self._rest_states(bodies)
+
+    def _rest_states(self, bodies: list[Body]):
+        # Sleeping bodies are skipped when snapshotting and interpolating so
+        # their states need to be left where the bodies stopped
+        for body in bodies:
+            last, current = self._last_states[body], self._current_states[body]
+            last.position = current.position = body.position
+            last.velocity = current.velocity = body.velocity
+
+    def _wake_island(self, group: BodyGroup):
+        for body in group.bodies:
+            self._sleeping_bodies.discard(body)
+            self._awake_bodies[body] = None
+            self._rest_steps[body] = 0
+
+    def _process_forces(self):
+        for force in self._forces:
+            force.process()
+
+    def _find_contacts(self):
+        """Find every pair of overlapping bodies and get the collision constraint for them"""
+        contacts = self._arbitrator.update(self._broadphase.update())
+
+        # An awake body touching a sleeping island wakes the whole island
+        for contact in contacts:
+            a, b = contact.a, contact.b
+            if a.island is not None and b.island is None and not b.static:
+                a.island.wake()
+            elif b.island is not None and a.island is None and not a.static:
+                b.island.wake()
+
+        # Anything still touching a sleeping body is only touching sleeping or static bodies
+        self._contacts = [
+            contact
+            for contact in contacts
+            if contact.a.island is None and contact.b.island is None
+        ]
+        self._active_constraints = [
+            constraint
+            for constraint in self._constraints
+            if not self._is_asleep(constraint)
+        ]
+
+    @staticmethod
+    def _is_asleep(constraint: Constraint) -> bool:
+        bodies = constraint.bodies
+        if type(bodies) is not tuple:
+            return bodies.island is not None
+        return all(body.island is not None for body in bodies)
+
+    def _pre_step(self):
+        """Cache everything the constraints need which won't change while iterating"""
+        dt = self.clock.dt
+        for constrain in self._active_constraints:
+            constrain.pre_step(dt)
+        for contact in self._contacts:
+            contact.pre_step(dt)
+
+    def _warm_start(self):
+        """Apply the impulses every constraint finished last step with"""
+        for constrain in self._active_constraints:
+            constrain.warm_start()
+        for contact in self._contacts:
+            contact.warm_start()
+
     def _iterate(self):
         """Run a single iteration of the impulse computation"""
-        # In future will do smart checking with grouping and ignoring sleeping
-        # bodies, but for now lets just iterate over every constraint
-        for constrain in self._constraints:
+        # Constraints which only touch sleeping bodies were filtered out when
+        # finding contacts, so this only iterates the awake islands
+        for constrain in self._active_constraints:
             constrain.iterate()
+        for contact in self._contacts:
+            contact.iterate()
 
-    def fixed_update(self):
-        PHYSICS_CLOCK.tick(GLOBAL_FIXED_CLOCK.dt)
+    def _solve(self):
+        """Warm start every constraint then run the impulse iterations"""
+        self._warm_start()
+        for _ in range(self.iterations):
+            self._iterate()
 
-        # Store previous
-        for body in self._bodies:
-            self._last_states[body] = StepState(body.position, body.velocity)
+    def _sweep(self, dt: float):
+        """Stop fast bodies passing through anything before positions are applied"""
+        # A sweep can wake what it hits, so go over the bodies awake to start with
+        for body in list(self._awake_bodies):
+            if body.static:
+                continue
+            vx, vy = body.velocity
+            if is_fast(vx * dt, vy * dt, *body.size):
+                self._sweep_body(body, dt)
+
+    def _sweep_body(self, body: Body, dt: float):
+        # Find the first body this one would touch moving with its velocity.
+        # Both are moved up to the point of impact, where an impulse stops
+        # them closing the way a contact would, shared between them by mass so
+        # momentum is kept. Against a static body that leaves this one sliding
+        # along the surface. Everything else is left to the discrete contacts
+        # next step.
+        start = body.bounds
+        velocity = body.velocity
+        dx, dy = velocity * dt
+        swept = start.union(start.move(dx, dy))
+
+        first = None
+        for other in self._broadphase.query(swept):
+            if other is body:
+                continue
+            ox, oy = other.velocity * dt
+            hit = time_of_impact(start, dx - ox, dy - oy, other.bounds)
+            if hit is not None and (first is None or hit[0] < first[0][0]):
+                first = hit, other
+        if first is None:
+            return
+
+        (toi, nx, ny), other = first
+        normal = Vec2(nx, ny)
+        other_velocity = other.velocity
+        approach = (velocity - other_velocity).dot(normal)
+        if approach >= 0.0:
+            return
+        inv_mass = 1.0 / body.mass
+        other_inv_mass = 0.0 if other.static else 1.0 / other.mass
+        impulse = -approach / (inv_mass + other_inv_mass)
+        body.velocity = velocity + (impulse * inv_mass) * normal
+        other.apply_impulse(-impulse * normal)
+
+        # Positions are applied as position + velocity * dt after this, so
+        # offset each position by what moving at its old velocity until impact adds
+        body.position += (velocity - body.velocity) * (dt * toi)
+        if other_inv_mass:
+            other.position += (other_velocity - other.velocity) * (dt * toi)
+
+    def _update_islands(self):
+        """Group the awake bodies into islands and put any that have been at rest long enough to sleep"""
+        # Union find over every constraint joining awake bodies. Static bodies
+        # never join islands, otherwise everything touching the floor would be one island
+        parent: dict[Body, Body] = {body: body for body in self._awake_bodies}
+
+        def find(body: Body) -> Body:
+            root = body
+            while parent[root] is not root:
+                root = parent[root]
+            while parent[body] is not root:
+                parent[body], body = root, parent[body]
+            return root
+
+        for constraint in self._active_constraints + self._contacts:
+            bodies = constraint.bodies
+            if type(bodies) is not tuple:
+                continue
+            roots = [find(body) for body in bodies if body in parent and not body.static]
+            for root in roots[1:]:
+                parent[root] = roots[0]
+
+        # Bodies pulled by outside forces never settle, so keep them awake
+        for force in self._forces:
+            if force.keeps_awake:
+                for body in force.bodies:
+                    if body in parent:
+                        self._rest_steps[body] = -1
+
+        islands: dict[Body, list[Body]] = {}
+        for body in self._awake_bodies:
+            if body.static:
+                continue
+            islands.setdefault(find(body), []).append(body)
+
+        rest_steps = self._rest_steps
+        for bodies in islands.values():
+            mass = sum(body.mass for body in bodies)
+            energy = sum(
+                0.5 * body.mass * body.velocity.length_squared() for body in bodies
+            )
+            if energy > SLEEP_ENERGY * mass:
+                for body in bodies:
+                    rest_steps[body] = 0
+                continue
+
+            resting = SLEEP_STEPS
+            for body in bodies:
+                rest_steps[body] += 1
+                resting = min(resting, rest_steps[body])
+            if resting >= SLEEP_STEPS:
+                self._sleep_island(bodies)
+
+    def _tick(self) -> float:
+        self.clock.tick(self.fixed_clock.dt)
+        return self.clock.dt
+
+    def _snapshot(self):
+        """Store the previous state, sleeping bodies haven't moved so their state is already right"""
+        last_states = self._last_states
+        for body in self._awake_bodies:
+            last = last_states[body]
+            last.position, last.velocity = body.position, body.velocity
             body.acceleration = Vec2()  # We find the acceleration every frame
 
-        # Do standard euler integration to get tentative velocities
-        # Gravity, Player Input, Force Fields etc
+    def _integrate(self, dt: float):
+        """Do standard euler integration to get tentative velocities"""
+        for body in self._awake_bodies:
+            body.velocity += body.acceleration * dt
 
-        for force in self._forces:
-            force.process()
+    def _apply(self, dt: float):
+        """Apply final velocities"""
+        for body in self._awake_bodies:
+            body.position += body.velocity * dt
 
-        for body in self._bodies:
-            body.velocity += body.acceleration * PHYSICS_CLOCK.dt
+    def fixed_update(self):
+        # Every phase is its own method so PhysicsStats can time them
+        dt = self._tick()
+        self._snapshot()
 
-        # Run impulse iterations
-        for _ in range(ITERATION_NUMBER):
-            self._iterate()
+        # Gravity, Player Input, Force Fields etc
+        self._process_forces()
+        self._integrate(dt)
 
-        # Apply final velocities
-        for body in self._bodies:
-            body.position += body.velocity * PHYSICS_CLOCK.dt
+        self._find_contacts()
+        self._pre_step()
+        self._solve()
 
-    def update(self):
-        # interpolate between old position and new position for every body
-        f = GLOBAL_FIXED_CLOCK.fraction
-        for body in self._bodies:
-            last = self._last_states[body]
-            lp, lv = last.position, last.velocity
+        self._sweep(dt)
+        self._apply(dt)
 
-            p = lp + f * (body.position - lp)
-            v = lv + f * (body.velocity - lv)
+        self._update_islands()
 
-            self._current_states[body] = StepState(
-                p, v
-            )  # Also need to update sprites, don't want to do double loops
+    def update(self):
+        # interpolate between old position and new position for every awake body
+        # The current states are updated in place so anything holding one stays up to date
+        f = self.fixed_clock.fraction
+        last_states, current_states = self._last_states, self._current_states
+        for body in self._awake_bodies:
+            last, current = last_states[body], current_states[body]
+            (lpx, lpy), (lvx, lvy) = last.position, last.velocity
+            px, py = body.position
+            vx, vy = body.velocity
+
+            current.position = Vec2(lpx + f * (px - lpx), lpy + f * (py - lpy))
+            current.velocity = Vec2(lvx + f * (vx - lvx), lvy + f * (vy - lvy))
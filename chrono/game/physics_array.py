@@ -0,0 +1,440 @@
+from __future__ import annotations
+import numpy as np
+from arcade import Vec2, XYWH
+from arcade.clock import FixedClock, GLOBAL_FIXED_CLOCK
+from arcade.types import Point2, Rect
+
+from chrono.game.slotmap import SlotMap
+from chrono.game.swept import FAST_FRACTION
+from chrono.game.physics import (
+    Body,
+    BodyGroup,
+    Force,
+    Physics,
+)
+
+
+class BodyArrays:
+    # Struct of arrays holding the state of every body in an ArrayPhysics world.
+    # Only the first `count` rows are live, the rest is spare capacity so
+    # adding bodies doesn't reallocate every time.
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.count: int = 0
+        self.capacity: int = 0
+
+        self.position: np.ndarray = np.zeros((0, 2))
+        self.velocity: np.ndarray = np.zeros((0, 2))
+        self.acceleration: np.ndarray = np.zeros((0, 2))
+        self.size: np.ndarray = np.zeros((0, 2))
+        self.mass: np.ndarray = np.zeros(0)
+        self.static: np.ndarray = np.zeros(0, dtype=bool)
+        self.awake: np.ndarray = np.zeros(0, dtype=bool)
+        self.handle: np.ndarray = np.full(0, -1, dtype=np.int64)
+
+        # The state each body was in last fixed update for smooth interpolation
+        self.last_position: np.ndarray = np.zeros((0, 2))
+        self.last_velocity: np.ndarray = np.zeros((0, 2))
+        # The interpolated state, written in place every ArrayPhysics.update
+        self.render_position: np.ndarray = np.zeros((0, 2))
+        self.render_velocity: np.ndarray = np.zeros((0, 2))
+
+        self.reserve(max(1, capacity))
+
+    def _allocate(
+        self, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> np.ndarray:
+        # Where reserve gets new storage for a column from
+        return np.zeros(shape, dtype=dtype)
+
+    _COLUMNS = (
+        "position",
+        "velocity",
+        "acceleration",
+        "size",
+        "mass",
+        "static",
+        "awake",
+        "handle",
+        "last_position",
+        "last_velocity",
+        "render_position",
+        "render_velocity",
+    )
+
+    def reserve(self, capacity: int):
+        if capacity <= self.capacity:
+            return
+        for name in BodyArrays._COLUMNS:
+            old = getattr(self, name)
+            new = self._allocate(name, (capacity,) + old.shape[1:], old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def push(
+        self,
+        position: Point2,
+        velocity: Point2,
+        size: Point2,
+        mass: float,
+        static: bool,
+    ) -> int:
+        if self.count == self.capacity:
+            self.reserve(2 * self.capacity)
+        idx = self.count
+        self.count += 1
+
+        # Vec2 swizzles attributes, so numpy poking it for array interfaces is
+        # very slow. Plain tuples avoid that.
+        position = (position[0], position[1])
+        velocity = (velocity[0], velocity[1])
+
+        self.position[idx] = self.last_position[idx] = position
+        self.velocity[idx] = self.last_velocity[idx] = velocity
+        self.render_position[idx] = position
+        self.render_velocity[idx] = velocity
+        self.acceleration[idx] = 0.0
+        self.size[idx] = (size[0], size[1])
+        self.mass[idx] = mass
+        self.static[idx] = static
+        self.awake[idx] = True
+        return idx
+
+    def swap_remove(self, idx: int) -> int:
+        # Move the last live row into `idx` so the arrays stay contiguous.
+        # Returns the index the moved row used to live at.
+        last = self.count - 1
+        if idx != last:
+            for name in BodyArrays._COLUMNS:
+                column = getattr(self, name)
+                column[idx] = column[last]
+        self.count = last
+        return last
+
+
+class BodyProxy:
+    # A thin stand in for Body which reads and writes its row of a BodyArrays.
+    # It has the same interface as Body so forces, constraints, and views
+    # written against Body work with it unchanged.
+    __slots__ = ("_arrays", "_index", "island", "handle")
+
+    def __init__(self, arrays: BodyArrays, index: int) -> None:
+        self._arrays: BodyArrays = arrays
+        self._index: int = index  # The row in _arrays, kept in step with the world's SlotMap
+        self.island: BodyGroup | None = None  # Only set while the body is asleep
+        self.handle: int = -1
+
+    @property
+    def position(self) -> Vec2:
+        return Vec2(*self._arrays.position[self._index].tolist())
+
+    @position.setter
+    def position(self, position: Point2):
+        self._arrays.position[self._index] = (position[0], position[1])
+
+    @property
+    def velocity(self) -> Vec2:
+        return Vec2(*self._arrays.velocity[self._index].tolist())
+
+    @velocity.setter
+    def velocity(self, velocity: Point2):
+        self._arrays.velocity[self._index] = (velocity[0], velocity[1])
+
+    @property
+    def acceleration(self) -> Vec2:
+        return Vec2(*self._arrays.acceleration[self._index].tolist())
+
+    @acceleration.setter
+    def acceleration(self, acceleration: Point2):
+        self._arrays.acceleration[self._index] = (acceleration[0], acceleration[1])
+
+    @property
+    def size(self) -> tuple[float, float]:
+        return tuple(self._arrays.size[self._index].tolist())
+
+    @size.setter
+    def size(self, size: Point2):
+        self._arrays.size[self._index] = (size[0], size[1])
+
+    @property
+    def mass(self) -> float:
+        return float(self._arrays.mass[self._index])
+
+    @mass.setter
+    def mass(self, mass: float):
+        self._arrays.mass[self._index] = mass
+
+    @property
+    def static(self) -> bool:
+        return bool(self._arrays.static[self._index])
+
+    @static.setter
+    def static(self, static: bool):
+        self._arrays.static[self._index] = static
+
+    @property
+    def bounds(self) -> Rect:
+        x, y = self._arrays.position[self._index].tolist()
+        w, h = self._arrays.size[self._index].tolist()
+        return XYWH(x, y, w, h)
+
+    def wake(self):
+        if self.island is not None:
+            self.island.wake()
+
+    def apply_force(self, force: Point2):
+        arrays, idx = self._arrays, self._index
+        if arrays.static[idx]:
+            return
+        self.wake()
+        inv_mass = 1.0 / arrays.mass[idx]
+        arrays.acceleration[idx, 0] += force[0] * inv_mass
+        arrays.acceleration[idx, 1] += force[1] * inv_mass
+
+    def apply_acceleration(self, acceleration: Point2):
+        arrays, idx = self._arrays, self._index
+        if arrays.static[idx]:
+            return
+        arrays.acceleration[idx, 0] += acceleration[0]
+        arrays.acceleration[idx, 1] += acceleration[1]
+
+    def apply_impulse(self, momentum: Point2):
+        arrays, idx = self._arrays, self._index
+        if arrays.static[idx]:
+            return
+        self.wake()
+        inv_mass = 1.0 / arrays.mass[idx]
+        arrays.velocity[idx, 0] += momentum[0] * inv_mass
+        arrays.velocity[idx, 1] += momentum[1] * inv_mass
+
+
+class StateView:
+    # What ArrayPhysics hands out instead of a StepState. It reads the body's
+    # interpolated row when asked, so one view is made per body and stays valid.
+    __slots__ = ("_body",)
+
+    def __init__(self, body: BodyProxy) -> None:
+        self._body: BodyProxy = body
+
+    @property
+    def position(self) -> Vec2:
+        body = self._body
+        return Vec2(*body._arrays.render_position[body._index].tolist())
+
+    @property
+    def velocity(self) -> Vec2:
+        body = self._body
+        return Vec2(*body._arrays.render_velocity[body._index].tolist())
+
+
+class ArrayPhysics(Physics):
+    # Struct of arrays mode for Physics. Every body lives as a row in one
+    # BodyArrays so integration is a few vectorised ops rather than a python
+    # loop. Bodies handed in are swapped for BodyProxy objects which should be
+    # used from then on.
+    arrays_type: type[BodyArrays] = BodyArrays
+
+    def __init__(
+        self, capacity: int = 64, fixed_clock: FixedClock = GLOBAL_FIXED_CLOCK
+    ) -> None:
+        super().__init__(fixed_clock)
+        self._arrays: BodyArrays = self.arrays_type(capacity)
+        # The dense index of each body's handle is its row in self._arrays
+        self._bodies: SlotMap[BodyProxy] = SlotMap()
+        self._views: dict[BodyProxy, StateView] = {}
+
+        # Adding a body can bring in one a force already holds, and removing one
+        # moves another into its row, so either invalidates every force's
+        # cached index array. The cache is keyed on both versions.
+        self._layout_version: int = 0
+        self._force_indices: dict[Force, tuple[int, int, np.ndarray]] = {}
+
+    def __getitem__(self, item: BodyProxy) -> StateView:
+        return self._views[item]
+
+    def __contains__(self, item: BodyProxy) -> bool:
+        return getattr(item, "_arrays", None) is self._arrays
+
+    def add_body(self, body: Body | BodyProxy) -> BodyProxy:
+        if body in self:
+            return body
+
+        idx = self._arrays.push(
+            body.position, body.velocity, body.size, body.mass, body.static
+        )
+        if isinstance(body, BodyProxy):
+            proxy = body
+            proxy._arrays, proxy._index = self._arrays, idx
+        else:
+            proxy = BodyProxy(self._arrays, idx)
+        proxy.handle = self._arrays.handle[idx] = self._bodies.insert(proxy)
+        self._views[proxy] = StateView(proxy)
+        self._track(proxy)
+        self._layout_version += 1
+        return proxy
+
+    def remove_body(self, body: BodyProxy):
+        if body not in self:
+            return
+        self._forget(body)
+        del self._views[body]
+        a, idx = self._arrays, body._index
+
+        # Give the proxy its own storage so it stays usable outside the world
+        own = BodyArrays(1)
+        own.push(a.position[idx], a.velocity[idx], a.size[idx], a.mass[idx], a.static[idx])
+
+        a.swap_remove(idx)
+        self._bodies.remove(body.handle)
+        if idx < a.count:
+            self._bodies.items[idx]._index = idx
+        self._layout_version += 1
+
+        body._arrays, body._index, body.handle = own, 0, -1
+
+    def remove_force(self, force: Force):
+        super().remove_force(force)
+        self._force_indices.pop(force, None)
+
+    def _sleep_island(self, bodies: list[BodyProxy]):
+        super()._sleep_island(bodies)
+        self._arrays.awake[[body._index for body in bodies]] = False
+
+    def _rest_states(self, bodies: list[BodyProxy]):
+        pass  # Every row is snapshotted and interpolated so sleeping bodies look after themselves
+
+    def capture(
+        self, positions: np.ndarray, velocities: np.ndarray, handles: np.ndarray
+    ) -> int:
+        a = self._arrays
+        n = a.count
+        positions[:n] = a.position[:n]
+        velocities[:n] = a.velocity[:n]
+        handles[:n] = a.handle[:n]
+        return n
+
+    def restore(
+        self, positions: np.ndarray, velocities: np.ndarray, handles: np.ndarray
+    ):
+        a = self._arrays
+        n = len(handles)
+        if n <= a.count and np.array_equal(handles, a.handle[:n]):
+            # Nothing has been removed since, so every row is where it was
+            rows = slice(0, n)
+        else:
+            found = [
+                (idx, self._bodies.index(handle))
+                for idx, handle in enumerate(handles.tolist())
+                if handle in self._bodies
+            ]
+            positions = positions[[old for old, _ in found]]
+            velocities = velocities[[old for old, _ in found]]
+            rows = [new for _, new in found]
+
+        a.position[rows] = positions
+        a.velocity[rows] = velocities
+        self._after_restore()
+
+    def _after_restore(self):
+        super()._after_restore()
+        # No interpolating across the jump
+        a = self._arrays
+        n = a.count
+        a.last_position[:n] = a.render_position[:n] = a.position[:n]
+        a.last_velocity[:n] = a.render_velocity[:n] = a.velocity[:n]
+
+    def _wake_island(self, group: BodyGroup):
+        super()._wake_island(group)
+        self._arrays.awake[[body._index for body in group.bodies]] = True
+
+    def _indices(self, force: Force) -> np.ndarray:
+        cached = self._force_indices.get(force)
+        if (
+            cached is not None
+            and cached[0] == self._layout_version
+            and cached[1] == force.version
+        ):
+            return cached[2]
+        indices = np.fromiter(
+            (body._index for body in force.bodies if body in self), dtype=np.intp
+        )
+        self._force_indices[force] = (self._layout_version, force.version, indices)
+        return indices
+
+    def _process_forces(self):
+        # Forces are grouped by type so each type is one vectorised pass,
+        # however many separate forces of it there are
+        a = self._arrays
+        groups: dict[type[Force], list[Force]] = {}
+        for force in self._forces:
+            if type(force).process_batch is Force.process_batch:
+                force.process()  # No batched version so go body by body
+                continue
+            groups.setdefault(type(force), []).append(force)
+
+        batches = []
+        for kind, forces in groups.items():
+            per_force = [self._indices(force) for force in forces]
+            indices = np.concatenate(per_force)
+            owners = np.repeat(
+                np.arange(len(forces)), [len(idx) for idx in per_force]
+            )
+            keeps_awake = np.array([force.keeps_awake for force in forces])[owners]
+            for idx in indices[keeps_awake & ~a.awake[indices]].tolist():
+                self._bodies.items[idx].wake()
+            batches.append((kind, forces, owners, indices))
+
+        # Only once everything that is kept awake has been woken
+        n = a.count
+        movable = a.awake[:n] & ~a.static[:n]
+        for kind, forces, owners, indices in batches:
+            moving = movable[indices]
+            if moving.any():
+                kind.process_group(forces, owners[moving], indices[moving], a)
+
+    def _sweep(self, dt: float):
+        a = self._arrays
+        n = a.count
+        half_size = (0.5 * FAST_FRACTION) * a.size[:n]
+        fast = (np.abs(a.velocity[:n] * dt) > half_size).any(axis=1)
+        fast &= a.awake[:n] & ~a.static[:n]
+        for idx in np.flatnonzero(fast).tolist():
+            self._sweep_body(self._bodies.items[idx], dt)
+
+    def extend_bodies(self, bodies: list[Body | BodyProxy]) -> list[BodyProxy]:
+        self._arrays.reserve(self._arrays.count + len(bodies))
+        return [self.add_body(body) for body in bodies]
+
+    def _snapshot(self):
+        a = self._arrays
+        n = a.count
+        a.last_position[:n] = a.position[:n]
+        a.last_velocity[:n] = a.velocity[:n]
+        a.acceleration[:n] = 0.0  # We find the acceleration every frame
+
+    def _integrate(self, dt: float):
+        # Forces skip sleeping bodies so they are left with no acceleration
+        a = self._arrays
+        n = a.count
+        a.velocity[:n] += a.acceleration[:n] * dt
+
+    def _apply(self, dt: float):
+        # Sleeping bodies have no velocity so they stay put
+        a = self._arrays
+        n = a.count
+        a.position[:n] += a.velocity[:n] * dt
+
+    def update(self):
+        # interpolate between old state and new state for every body, in place
+        f = self.fixed_clock.fraction
+        a = self._arrays
+        n = a.count
+        for last, current, render in (
+            (a.last_position, a.position, a.render_position),
+            (a.last_velocity, a.velocity, a.render_velocity),
+        ):
+            out = render[:n]
+            np.subtract(current[:n], last[:n], out=out)
+            out *= f
+            out += last[:n]
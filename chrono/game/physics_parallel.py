@@ -0,0 +1,372 @@
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+import os
+import weakref
+
+import numpy as np
+from arcade.clock import FixedClock, GLOBAL_FIXED_CLOCK
+
+from chrono.game.physics import Constraint, StaticBounds, CollisionConstraint
+from chrono.game.physics_array import ArrayPhysics, BodyArrays
+
+# Below this many constraints handing islands to other processes costs more than solving them
+PARALLEL_MIN_CONSTRAINTS = 256
+
+# Column name -> (shared memory name, shape, dtype), enough for another process to find an array
+ColumnSpec = dict[str, tuple[str, tuple[int, ...], str]]
+
+
+class SharedColumns:
+    # Named numpy arrays backed by shared memory, so worker processes can read
+    # and write them in place rather than having them pickled back and forth.
+    # Reallocating a column makes a new block, so specs have to be fetched again.
+
+    def __init__(self) -> None:
+        self._blocks: dict[str, SharedMemory] = {}
+        self._retired: list[SharedMemory] = []
+        self.arrays: dict[str, np.ndarray] = {}
+
+    def allocate(
+        self, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> np.ndarray:
+        self._close_retired()
+        dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        block = SharedMemory(create=True, size=nbytes)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.fill(0)
+
+        old = self._blocks.get(name)
+        if old is not None:
+            # Unlinking only removes the name, whoever is still copying out of it can finish
+            old.unlink()
+            self._retired.append(old)
+        self._blocks[name] = block
+        self.arrays[name] = array
+        return array
+
+    def _close_retired(self):
+        # A block can't be closed while any array still looks into it
+        still_open = []
+        for block in self._retired:
+            try:
+                block.close()
+            except BufferError:
+                still_open.append(block)
+        self._retired = still_open
+
+    def spec(self, names: tuple[str, ...]) -> ColumnSpec:
+        return {
+            name: (
+                self._blocks[name].name,
+                self.arrays[name].shape,
+                self.arrays[name].dtype.str,
+            )
+            for name in names
+        }
+
+    def close(self):
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.unlink()
+        self._retired.extend(self._blocks.values())
+        self._blocks.clear()
+        self._close_retired()
+
+
+class SharedBodyArrays(BodyArrays):
+    # BodyArrays whose columns live in shared memory
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.shared: SharedColumns = SharedColumns()
+        super().__init__(capacity)
+
+    def _allocate(
+        self, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> np.ndarray:
+        return self.shared.allocate(name, shape, dtype)
+
+
+# Each worker keeps the blocks it has attached to, so only new ones are opened
+_attached: dict[str, SharedMemory] = {}
+
+
+def _view(name: str, shape: tuple[int, ...], dtype: str) -> np.ndarray:
+    block = _attached.get(name)
+    if block is None:
+        block = _attached[name] = SharedMemory(name)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _forget_stale(specs: ColumnSpec):
+    live = {spec[0] for spec in specs.values()}
+    for name in [name for name in _attached if name not in live]:
+        _attached.pop(name).close()
+
+
+def _detach_all():
+    for block in _attached.values():
+        block.close()
+    _attached.clear()
+
+
+def _init_worker():
+    # Pool workers leave without running atexit, but multiprocessing's own
+    # finalizers do run, so that is where a worker lets go of its blocks
+    Finalize(None, _detach_all, exitpriority=10)
+
+
+def solve_range(columns: ColumnSpec, start: int, stop: int, iterations: int):
+    """
+    Run every impulse iteration over a contiguous range of packed constraints.
+
+    The range has to cover whole islands, so no other process touches the
+    same bodies. Velocities and accumulated impulses are written back in place.
+    """
+    _forget_stale(columns)
+    arrays = {name: _view(*spec) for name, spec in columns.items()}
+    velocity, mass, static = arrays["velocity"], arrays["mass"], arrays["static"]
+
+    a = arrays["a"][start:stop].tolist()
+    b = arrays["b"][start:stop].tolist()
+    nx = arrays["normal"][start:stop, 0].tolist()
+    ny = arrays["normal"][start:stop, 1].tolist()
+    bias = arrays["bias"][start:stop].tolist()
+    effective = arrays["effective_mass"][start:stop].tolist()
+    impulse = arrays["impulse"][start:stop].tolist()
+
+    # Row -1 is the immovable world a StaticBounds pushes against
+    rows = set(a) | set(b)
+    rows.discard(-1)
+    vx, vy, inv = {-1: 0.0}, {-1: 0.0}, {-1: 0.0}
+    for row in rows:
+        vx[row], vy[row] = velocity[row].tolist()
+        inv[row] = 0.0 if static[row] else 1.0 / mass[row]
+
+    for _ in range(iterations):
+        for k in range(stop - start):
+            if not effective[k]:
+                continue
+            i, j, x, y = a[k], b[k], nx[k], ny[k]
+            relative = (vx[j] - vx[i]) * x + (vy[j] - vy[i]) * y
+            old = impulse[k]
+            impulse[k] = max(0.0, old + (-relative + bias[k]) * effective[k])
+            delta = impulse[k] - old
+            vx[i] -= delta * x * inv[i]
+            vy[i] -= delta * y * inv[i]
+            vx[j] += delta * x * inv[j]
+            vy[j] += delta * y * inv[j]
+
+    for row in rows:
+        if inv[row]:  # Static bodies can be shared between islands, and never change
+            velocity[row] = vx[row], vy[row]
+    arrays["impulse"][start:stop] = impulse
+
+
+class ParallelPhysics(ArrayPhysics):
+    # ArrayPhysics which solves independent islands of constraints on other cores.
+    # Body state lives in shared memory, and each step the constraints are
+    # packed into shared arrays grouped by island. Whole islands are dealt out
+    # to a persistent pool of worker processes, which iterate them in place.
+    # Only StaticBounds and CollisionConstraint can be packed, islands with any
+    # other constraint are solved here while the workers run. Small worlds are
+    # solved serially like ArrayPhysics as dispatching would cost more.
+    arrays_type = SharedBodyArrays
+
+    _BODY_COLUMNS = ("velocity", "mass", "static")
+    _CONSTRAINT_COLUMNS = (
+        "a",
+        "b",
+        "normal",
+        "bias",
+        "effective_mass",
+        "impulse",
+    )
+
+    def __init__(
+        self,
+        capacity: int = 64,
+        fixed_clock: FixedClock = GLOBAL_FIXED_CLOCK,
+        workers: int | None = None,
+        min_constraints: int = PARALLEL_MIN_CONSTRAINTS,
+    ) -> None:
+        super().__init__(capacity, fixed_clock)
+        self.workers: int = workers or os.cpu_count() or 1
+        self.min_constraints: int = min_constraints
+
+        self._constraint_columns: SharedColumns = SharedColumns()
+        self._constraint_capacity: int = 0
+        self._reserve_constraints(256)
+        # Started on the first parallel solve. Kept in a list the finalizer
+        # holds, so the pool and shared memory are given back on garbage
+        # collection too. That never happens in a process that exits without
+        # running finalizers, like a pool worker, so close the world when done.
+        self._pool: list[ProcessPoolExecutor] = []
+        self._finalizer = weakref.finalize(
+            self,
+            ParallelPhysics._release,
+            self._pool,
+            self._arrays.shared,
+            self._constraint_columns,
+        )
+
+    @staticmethod
+    def _release(pool: list[ProcessPoolExecutor], *columns: SharedColumns):
+        for executor in pool:
+            executor.shutdown()
+        pool.clear()
+        for shared in columns:
+            shared.close()
+
+    def close(self):
+        """Shut down the worker pool and free the shared memory."""
+        self._finalizer()
+
+    def _reserve_constraints(self, capacity: int):
+        if capacity <= self._constraint_capacity:
+            return
+        shared = self._constraint_columns
+        shared.allocate("a", (capacity,), np.int64)
+        shared.allocate("b", (capacity,), np.int64)
+        shared.allocate("normal", (capacity, 2), np.float64)
+        shared.allocate("bias", (capacity,), np.float64)
+        shared.allocate("effective_mass", (capacity,), np.float64)
+        shared.allocate("impulse", (capacity,), np.float64)
+        self._constraint_capacity = capacity
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if not self._pool:
+            self._pool.append(
+                ProcessPoolExecutor(self.workers, initializer=_init_worker)
+            )
+        return self._pool[0]
+
+    @staticmethod
+    def _rows(constraint: Constraint) -> tuple[int, int] | None:
+        # The rows a packed constraint acts between, or None if it can't be packed
+        kind = type(constraint)
+        if kind is StaticBounds:
+            return -1, constraint.bodies._index
+        if kind is CollisionConstraint:
+            return constraint.a._index, constraint.b._index
+        return None
+
+    def _islands(
+        self, constraints: list[Constraint]
+    ) -> tuple[list[list[Constraint]], list[Constraint]]:
+        """Split the constraints into islands that can be packed, and those which have to be solved here"""
+        static = self._arrays.static
+        parent: dict[int, int] = {}
+
+        def find(row: int) -> int:
+            root = row
+            while parent.setdefault(root, root) != root:
+                root = parent[root]
+            while parent[row] != root:
+                parent[row], row = root, parent[row]
+            return root
+
+        def dynamic_rows(constraint: Constraint) -> list[int]:
+            bodies = constraint.bodies
+            if type(bodies) is not tuple:
+                bodies = (bodies,)
+            return [body._index for body in bodies if not static[body._index]]
+
+        rows = [dynamic_rows(constraint) for constraint in constraints]
+        for constraint_rows in rows:
+            roots = [find(row) for row in constraint_rows]
+            for root in roots[1:]:
+                parent[root] = roots[0]
+
+        islands: dict[int, list[Constraint]] = {}
+        unpackable: set[int] = set()
+        for constraint, constraint_rows in zip(constraints, rows):
+            if not constraint_rows:
+                continue  # Only touches static bodies so it can't do anything
+            root = find(constraint_rows[0])
+            islands.setdefault(root, []).append(constraint)
+            if self._rows(constraint) is None:
+                unpackable.add(root)
+
+        serial = [constraint for root in unpackable for constraint in islands.pop(root)]
+        return list(islands.values()), serial
+
+    def _pack(self, batches: list[list[list[Constraint]]]) -> list[tuple[int, int]]:
+        """Write each batch's constraints into the shared columns, returning the range each one filled"""
+        columns = self._constraint_columns.arrays
+        ranges = []
+        start = 0
+        for batch in batches:
+            constraints = [constraint for island in batch for constraint in island]
+            stop = start + len(constraints)
+            rows = [self._rows(constraint) for constraint in constraints]
+            columns["a"][start:stop] = [row[0] for row in rows]
+            columns["b"][start:stop] = [row[1] for row in rows]
+            columns["normal"][start:stop] = [tuple(c.normal) for c in constraints]
+            columns["bias"][start:stop] = [c.bias for c in constraints]
+            # A StaticBounds that isn't touching is skipped the same as a zero mass contact
+            columns["effective_mass"][start:stop] = [
+                c.mass if type(c) is not StaticBounds or c.touching else 0.0
+                for c in constraints
+            ]
+            columns["impulse"][start:stop] = [c.impulse for c in constraints]
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
+    def _solve(self):
+        constraints = self._active_constraints + self._contacts
+        if self.workers < 2 or len(constraints) < self.min_constraints:
+            super()._solve()
+            return
+
+        islands, serial = self._islands(constraints)
+        if len(islands) < 2:
+            super()._solve()
+            return
+
+        self._warm_start()
+        self._solve_islands(islands, serial)
+
+    def _solve_islands(
+        self, islands: list[list[Constraint]], serial: list[Constraint]
+    ):
+        # Deal the biggest islands out first, each to whichever batch is smallest
+        batches: list[list[list[Constraint]]] = [[] for _ in range(self.workers)]
+        sizes = [0] * self.workers
+        for island in sorted(islands, key=len, reverse=True):
+            idx = sizes.index(min(sizes))
+            batches[idx].append(island)
+            sizes[idx] += len(island)
+        batches = [batch for batch in batches if batch]
+
+        total = sum(sizes)
+        if total > self._constraint_capacity:
+            self._reserve_constraints(max(total, 2 * self._constraint_capacity))
+        ranges = self._pack(batches)
+        columns = self._arrays.shared.spec(self._BODY_COLUMNS)
+        columns.update(self._constraint_columns.spec(self._CONSTRAINT_COLUMNS))
+
+        pool = self._get_pool()
+        futures: list[Future] = [
+            pool.submit(solve_range, columns, start, stop, self.iterations)
+            for start, stop in ranges
+        ]
+
+        # Anything that couldn't be packed runs here while the workers are busy
+        for _ in range(self.iterations):
+            for constraint in serial:
+                constraint.iterate()
+
+        for future in futures:
+            future.result()
+
+        # Keep the impulses on the constraints so they warm start next step
+        impulses = self._constraint_columns.arrays["impulse"]
+        for batch, (start, stop) in zip(batches, ranges):
+            constraints = [constraint for island in batch for constraint in island]
+            solved = impulses[start:stop].tolist()
+            for constraint, impulse in zip(constraints, solved):
+                constraint.impulse = impulse
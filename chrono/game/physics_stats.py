@@ -0,0 +1,145 @@
+from __future__ import annotations
+from time import perf_counter_ns
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from chrono.game.physics import Physics
+
+# Each phase of Physics.fixed_update and the method that runs it. The last,
+# working out the solver residual, is run by the stats themselves on the
+# steps they sample it on, so the time it adds is seen rather than hidden
+PHASES: dict[str, str] = {
+    "tick": "_tick",
+    "snapshot": "_snapshot",
+    "forces": "_process_forces",
+    "integrate": "_integrate",
+    "contacts": "_find_contacts",
+    "pre_step": "_pre_step",
+    "solve": "_solve",
+    "sweep": "_sweep",
+    "apply": "_apply",
+    "islands": "_update_islands",
+    "residual": "residual",
+}
+# Steps between solver residual samples, it is a full pass over every constraint
+RESIDUAL_INTERVAL = 10
+COUNTS = ("bodies", "awake", "forces", "constraints", "contacts")
+
+
+class PhysicsStats:
+    # Rolling record of how long each phase of a Physics world's last steps took.
+    # While enabled every phase method is shadowed on the world instance by
+    # one that times it, and fixed_update by one which also records counts and,
+    # every `residual_interval` steps, the solver residual once the step is
+    # done. Steps the residual isn't sampled on keep NaN. Disabling deletes the
+    # shadows so the world calls its own methods directly again, and costs
+    # nothing. Use Physics.enable_stats and Physics.disable_stats.
+
+    def __init__(
+        self,
+        physics: Physics,
+        window: int = 120,
+        residual_interval: int = RESIDUAL_INTERVAL,
+    ) -> None:
+        self._physics: Physics = physics
+        self.window: int = window
+        self.residual_interval: int = residual_interval  # 0 never samples it
+        self.steps: int = 0  # Total steps recorded, only the last `window` are kept
+
+        self._times: np.ndarray = np.zeros((window, len(PHASES)), dtype=np.int64)
+        self._counts: np.ndarray = np.zeros((window, len(COUNTS)), dtype=np.int64)
+        self._residuals: np.ndarray = np.zeros(window)
+        self._row: int = 0
+
+    def _timed(self, column: int, method: Callable) -> Callable:
+        times = self._times
+
+        def timed(*args):
+            start = perf_counter_ns()
+            result = method(*args)
+            times[self._row, column] += perf_counter_ns() - start
+            return result
+
+        return timed
+
+    def attach(self):
+        physics = self._physics
+        for column, name in enumerate(PHASES.values()):
+            setattr(physics, name, self._timed(column, getattr(physics, name)))
+
+        step = physics.fixed_update
+
+        def fixed_update():
+            self._row = self.steps % self.window
+            self._times[self._row] = 0
+            step()
+            self._record()
+
+        physics.fixed_update = fixed_update
+
+    def detach(self):
+        physics = self._physics
+        for name in (*PHASES.values(), "fixed_update"):
+            if name in vars(physics):
+                delattr(physics, name)
+
+    def _record(self):
+        physics = self._physics
+        self._counts[self._row] = (
+            len(physics),
+            physics.awake_count,
+            len(physics._forces),
+            len(physics._active_constraints),
+            len(physics._contacts),
+        )
+        interval = self.residual_interval
+        if interval and not self.steps % interval:
+            self._residuals[self._row] = physics.residual()
+        else:
+            self._residuals[self._row] = np.nan
+        self.steps += 1
+
+    def clear(self):
+        self.steps = 0
+
+    def __len__(self) -> int:
+        return min(self.steps, self.window)
+
+    def phase_ns(self) -> dict[str, np.ndarray]:
+        """Every phase's time in each kept step, oldest first."""
+        rows = self._ordered(self._times)
+        return {phase: rows[:, idx] for idx, phase in enumerate(PHASES)}
+
+    def residuals(self) -> np.ndarray:
+        """The solver residual of each kept step, NaN where it wasn't sampled."""
+        return self._ordered(self._residuals)
+
+    def _ordered(self, ring: np.ndarray) -> np.ndarray:
+        if self.steps <= self.window:
+            return ring[: self.steps]
+        return np.roll(ring, -(self.steps % self.window), axis=0)
+
+    def summary(self) -> dict:
+        """Means over the kept steps, in microseconds for times."""
+        count = len(self)
+        if not count:
+            return {"steps": 0}
+        times = self._ordered(self._times)
+        counts = self._ordered(self._counts)
+        residuals = self._ordered(self._residuals)
+        residuals = residuals[~np.isnan(residuals)]
+        return {
+            "steps": count,
+            "step_us": float(times.sum(axis=1).mean()) / 1000.0,
+            "phase_us": {
+                phase: float(times[:, idx].mean()) / 1000.0
+                for idx, phase in enumerate(PHASES)
+            },
+            "counts": {
+                name: float(counts[:, idx].mean()) for idx, name in enumerate(COUNTS)
+            },
+            "residual": float(residuals.mean()) if len(residuals) else np.nan,
+            "max_residual": float(residuals.max()) if len(residuals) else np.nan,
+        }
@@ -2,17 +2,20 @@ from math import sqrt
 from arcade import View, Sprite, SpriteList, Vec2, XYWH, draw_line, draw_sprite
 
 from chrono.game.physics import (
-    Physics,
     Body,
     StaticGravity,
     StaticDrag,
     Spring,
     StaticBounds,
 )
+from chrono.game.physics_array import ArrayPhysics, BodyProxy
+from chrono.game.history import RewindHistory
+from chrono.input import ActionState
 from resources import load_texture
 from chrono.game.lerp import perc, lerp
 
 SPRING_TENSION = 100.0
+REWIND_SECONDS = 10.0
 
 
 class PhysicsView(View):
@@ -20,17 +23,18 @@ class PhysicsView(View):
     def __init__(self, window=None) -> None:
         super().__init__(window)
 
-        self.physics = Physics()
+        self.physics = ArrayPhysics()
         self.sprites: SpriteList = SpriteList()
 
         self.box_sprite: Sprite = Sprite(load_texture("square"))
         self.box_sprite.size = 32, 32
         self.sprites.append(self.box_sprite)
 
-        self.box_body: Body = Body(Vec2(*self.window.center), Vec2(), (32, 32), 1.0)
-        self.physics.add_body(self.box_body)
+        self.box_body: BodyProxy = self.physics.add_body(
+            Body(Vec2(*self.window.center), Vec2(), (32, 32), 1.0)
+        )
 
-        self.body_map: dict[Body, Sprite] = {self.box_body: self.box_sprite}
+        self.body_map: dict[BodyProxy, Sprite] = {self.box_body: self.box_sprite}
 
         self.gravity: StaticGravity = StaticGravity(
             [self.box_body], Vec2(0.0, -1.0), 2000.0
@@ -43,6 +47,11 @@ class PhysicsView(View):
         self.bounds: StaticBounds = StaticBounds(self.box_body, self.window.rect)
         self.physics.add_contraint(self.bounds)
 
+        self.history: RewindHistory = RewindHistory.from_seconds(
+            self.physics, REWIND_SECONDS
+        )
+        self.rewinding: bool = False
+
         self._bg = Sprite(load_texture("bg"))
         self._bg.position = Vec2(*self.window.center)
         self.mouse_pos: Vec2 | None = None
@@ -50,11 +59,22 @@ class PhysicsView(View):
     def reset(self):
         self.box_body.position = Vec2(*self.window.center)
         self.box_body.velocity = Vec2()
+        self.box_body.wake()
 
         self.spring = None
+        self.history.clear()
+        self.rewinding = False
+
+    def on_action(self, action: str, action_state: ActionState):
+        if action == "rewind":
+            self.rewinding = action_state == ActionState.PRESSED
 
     def on_fixed_update(self, delta_time: float):
+        if self.rewinding:
+            self.history.rewind()
+            return
         self.physics.fixed_update()
+        self.history.record()
 
     def on_draw(self) -> bool | None:
         self.clear()
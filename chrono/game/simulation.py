@@ -0,0 +1,365 @@
+"""
+The game's rules, free of any window or OpenGL
+
+Simulation owns the level's sprites and steps the player, platforms,
+triggers and goal. Sprites are only used as plain data here, so it runs
+the same with or without a window. GameView draws what it reads from one,
+and chrono.game.headless drives one straight from a script.
+"""
+
+from __future__ import annotations
+from functools import partial
+
+from arcade import Sprite, Vec2, XYWH, LRBT, check_for_collision
+from arcade.clock import Clock
+import numpy as np
+
+from chrono.game.events import Event, EventTimeline
+from chrono.game.gif import GIF
+from chrono.game.grid import SpatialGrid, sprite_bounds
+from chrono.game.level import Level, LevelSprites
+from chrono.game.swept import is_fast, time_of_impact
+from chrono.game.tracks import Tracks
+from resources import get_png_path, load_texture
+
+PLAYER_GROUND_SPEED = 2000.0  # How fast the player accelerates left and right
+PLAYER_AIR_SPEED = 1200.0  # How fast the player accelerates left and right in the air
+PLAYER_JUMP_SPEED = 1000.0  # The velocity impules the player recieves upwards
+# The acceleration of the player due to gravity while they are falling
+PLAYER_JUMP_FALL = 2000.0
+PLAYER_JUMP_RELEASE = 1500.0  # The acceleration of the player due to gravity while they are rising, but not jumping
+PLAYER_JUMP_HOLD = 1000.0  # The acceleration of the player due to gravity while they are rising and jumping
+PLAYER_DRAG = 0.005  # how much the air drags on the player, assumes the player is 100kg so we only deal with acceleration no forces
+PLAYER_FRICTION_HOLD = 0.04  # how much the ground resists player movement when they are travelling in that direction, assumes the player is 100kg so we only deal with acceleration no forces
+PLAYER_FRICTION_RELEASE = 0.9  # how much the ground resists player movement, assumes the player is 100kg so we only deal with acceleration no forces
+
+PLAYER_CAYOTE = 1 / 15.0  # ~4 frames
+
+SQUISH_FACTOR = 1500
+
+TERRAIN_CELL_SIZE = 64.0  # Big enough that the player only ever overlaps a few cells
+
+
+class Simulation:
+    # One play through of a level.
+    # Input comes in through `on_action` and `horizontal`, and each `step`
+    # moves everything on by a fixed update. Afterwards `won` says whether
+    # the player reached the goal, and `fell` whether they left the level,
+    # which needs a `reset`. When streamed the static terrain is left for a
+    # ChunkStreamer to add to `terrain_grid`, otherwise it is all added now.
+
+    def __init__(self, level: Level, streamed: bool = False) -> None:
+        self.level: Level = level
+        # Trigger targets and platforms are always loaded, all other terrain may be streamed in chunks
+        self.streamed: np.ndarray = np.flatnonzero(
+            ~np.isin(level.terrain["name"], level.triggers["target"])
+        )
+        self.sprites: LevelSprites = LevelSprites(
+            level, terrain=np.empty(0, dtype=np.int64) if streamed else None
+        )
+
+        # -- TEMP PLAYER --
+        self._player_texture = load_texture("jiggycat")
+        self.player: Sprite = Sprite(self._player_texture)
+        self.player.position = level.player
+        self.goal: GIF = GIF(get_png_path("goal"), 1, 29, 29, 30)
+        self.goal.position = level.goal
+
+        self.platforms: list[Sprite] = self.sprites.platforms
+        self.tracks: Tracks = Tracks(level.platforms, level.points)
+        self.triggers: list[Sprite] = self.sprites.triggers
+        self.trigger_targets: list[Sprite] = self.sprites.targets
+        self.trigger_grid: SpatialGrid[int] = SpatialGrid(TERRAIN_CELL_SIZE)
+        for idx, trigger in enumerate(self.triggers):
+            self.trigger_grid.insert(idx, sprite_bounds(trigger))
+
+        # Only terrain near the player is checked against it
+        self.terrain: list[Sprite] = [*self.platforms, *self.sprites.terrain]
+        self.terrain_grid: SpatialGrid[Sprite] = SpatialGrid(TERRAIN_CELL_SIZE)
+        for terrain in self.terrain:
+            self.terrain_grid.insert(terrain, sprite_bounds(terrain))
+
+        # Where everything that moves or can be taken out of the level starts, for reset
+        self._initial: dict[Sprite, tuple[Vec2, Vec2]] = {
+            sprite: (sprite.position, sprite.velocity)
+            for sprite in (self.player, *self.platforms, *self.trigger_targets)
+        }
+        self.reset()
+
+    def reset(self):
+        # Only put back what changes during play, the sprites are all reused.
+        # The clocks start from zero rather than the window's time so every
+        # play through is the same, which replaying recorded input relies on.
+        self.manipulation_clock: Clock = Clock()
+        self.player_clock: Clock = Clock()
+
+        self.horizontal: float = 0.0  # How far left or right the player is being steered
+        self.won: bool = False
+        self.fell: bool = False
+
+        self.player.texture = self._player_texture
+        self.player.size = 32, 32
+        self.player_velocity: Vec2 = Vec2()
+        self.player_jumping: bool = False
+        self.player_reversing_time: bool = False
+        self.player_jump_time: float = -float("inf")
+        self.player_on_ground: bool = False
+        self.player_last_ground_time: float = -float("inf")
+        self.contact_platform: Sprite = None
+
+        for sprite, (position, velocity) in self._initial.items():
+            sprite.position = position
+            sprite.velocity = velocity
+        for platform in self.platforms:
+            self.terrain_grid.move(platform, sprite_bounds(platform))
+
+        self.events: EventTimeline = EventTimeline(self.manipulation_clock.time)
+        # How many applied touches each target has, it is in the level while any do
+        self._target_touches: dict[Sprite, int] = dict.fromkeys(self.trigger_targets, 0)
+        for target in self.trigger_targets:
+            self._show_target(target, False)
+        # Targets start in the level as if every trigger was touched as the
+        # clock started, and a player starting on a trigger holds that touch.
+        # Afterwards each trigger's event while the player is still touching it
+        self._trigger_events: list[Event | None] = [
+            self._touch_trigger(idx) for idx in range(len(self.triggers))
+        ]
+
+        self.goal.time = 0.0
+        self.goal.update_animation(0.0)
+
+    def on_action(self, action: str, pressed: bool):
+        match action:
+            case "jump":
+                self.player_jumping = pressed
+                if not self.player_jumping:
+                    return
+                self.player_jump_time = self.player_clock.time
+                if (
+                    not self.player_on_ground
+                    and self.player_clock.time_since(self.player_last_ground_time)
+                    > PLAYER_CAYOTE
+                ):
+                    return
+            case "rewind":
+                self.player_reversing_time = pressed
+                if self.player_reversing_time:
+                    self.manipulation_clock.set_tick_speed(-1.0)
+                    self.player_clock.set_tick_speed(0.0)
+                else:
+                    self.manipulation_clock.set_tick_speed(1.0)
+                    self.player_clock.set_tick_speed(1.0)
+
+    def _fire_triggers(self):
+        # Touching a trigger records an event which puts its target in the
+        # level, so rewinding to before every touch takes the target out. While
+        # the player stays on a trigger its event is held at the current time.
+        touching = [None] * len(self.triggers)
+        if not self.player_reversing_time:
+            for idx in self.trigger_grid.query(sprite_bounds(self.player)):
+                if not check_for_collision(self.player, self.triggers[idx]):
+                    continue
+                event = self._trigger_events[idx]
+                if event is None or not self.events.hold(event):
+                    event = self._touch_trigger(idx)
+                touching[idx] = event
+        self._trigger_events = touching
+
+    def _touch_trigger(self, idx: int) -> Event:
+        target = self.trigger_targets[idx]
+        return self.events.record(
+            partial(self._add_target, target), partial(self._remove_target, target)
+        )
+
+    # Touches are counted rather than setting the target in or out, so undoing
+    # one only takes the target out if no other touch before it is applied
+
+    def _add_target(self, target: Sprite):
+        self._target_touches[target] += 1
+        if self._target_touches[target] == 1:
+            self._show_target(target, True)
+
+    def _remove_target(self, target: Sprite):
+        self._target_touches[target] -= 1
+        if not self._target_touches[target]:
+            self._show_target(target, False)
+
+    def _show_target(self, target: Sprite, shown: bool):
+        target.visible = shown
+        if shown and target not in self.terrain:
+            self.terrain.append(target)
+            self.terrain_grid.insert(target, sprite_bounds(target))
+        elif not shown and target in self.terrain:
+            self.terrain.remove(target)
+            self.terrain_grid.remove(target)
+
+    def _move_player(self, dt: float):
+        # Slow moves are left to the overlap checks next update. A fast move
+        # is swept against the terrain and stops at the first thing it hits,
+        # sliding along it for the rest of the update, so it can't skip through
+        displacement = self.player_velocity * dt
+        pw, ph, *_ = self.player.size
+        if not is_fast(*displacement, pw, ph):
+            self.player.position += displacement
+            return
+
+        start = XYWH(*self.player.position, pw, ph)
+        first = None
+        swept = start.union(start.move(*displacement))
+        for terrain in self.terrain_grid.query(swept):
+            dx, dy = displacement - terrain.velocity * dt
+            w, h, *_ = terrain.size
+            hit = time_of_impact(start, dx, dy, XYWH(*terrain.position, w, h))
+            if hit is not None and (first is None or hit[0] < first[0][0]):
+                first = hit, terrain
+        if first is None:
+            self.player.position += displacement
+            return
+
+        (toi, nx, ny), terrain = first
+        normal = Vec2(nx, ny)
+        approach = normal.dot(self.player_velocity - terrain.velocity)
+        if approach < 0.0:
+            self.player_velocity -= approach * normal
+        self.player.position += (
+            displacement * toi + self.player_velocity * dt * (1.0 - toi)
+        )
+
+    def step(self, delta_time: float):
+        self.manipulation_clock.tick(delta_time)
+        self.player_clock.tick(delta_time)
+        positions, velocities = self.tracks.evaluate(self.manipulation_clock.time)
+        # The tracks give velocity against the clock, which runs backwards while rewinding
+        velocities *= self.manipulation_clock.speed
+        for platform, (x, y), (vx, vy) in zip(
+            self.platforms, positions.tolist(), velocities.tolist()
+        ):
+            platform.position = x, y
+            platform.velocity = Vec2(vx, vy)
+            self.terrain_grid.move(platform, sprite_bounds(platform))
+
+        # Acceleration
+        if self.player_velocity.y >= 0:
+            fall_acceleration = -Vec2(
+                0.0, PLAYER_JUMP_HOLD if self.player_jumping else PLAYER_JUMP_RELEASE
+            )
+        else:
+            fall_acceleration = -Vec2(0.0, PLAYER_JUMP_FALL)
+        self.player_velocity += fall_acceleration * self.player_clock.dt
+
+        horizontal = self.horizontal
+        self.player_velocity += Vec2(
+            horizontal
+            * (PLAYER_GROUND_SPEED if self.player_on_ground else PLAYER_AIR_SPEED)
+            * self.player_clock.dt,
+            0.0,
+        )
+
+        v_length_sqr = self.player_velocity.length_squared()
+        v_dir = self.player_velocity.normalize()
+
+        # Drag
+
+        self.player_velocity += (
+            0.5 * v_length_sqr * PLAYER_DRAG * self.player_clock.dt * -v_dir
+        )  # Air Resistance
+        if self.player_on_ground:
+            # Assuming horizontal
+            drag_vel = self.contact_platform.velocity.x
+            holding = horizontal / (abs(horizontal) or 1) == self.player_velocity.x / (
+                abs(self.player_velocity.x) or 1.0
+            )
+            drag = (
+                PLAYER_FRICTION_HOLD
+                if horizontal and holding
+                else PLAYER_FRICTION_RELEASE
+            )
+
+            v = self.player_velocity.x - drag_vel
+            v_dir = v / (abs(v) or 1)
+            self.player_velocity += (
+                drag * PLAYER_JUMP_FALL * self.player_clock.dt * -v_dir
+            )
+
+        # Resolving Collisions
+        px, py = self.player.position
+        pw, ph, *_ = self.player.size
+        pl, pr, pb, pt = px - pw / 2.0, px + pw / 2.0, py - ph / 2.0, py + ph / 2.0
+        on_ground = False
+        contact_platform: Sprite = None
+        for terrain in self.terrain_grid.query(LRBT(pl, pr, pb, pt)):
+            x, y = terrain.position
+            w, h, *_ = terrain.size
+            l, r, b, t = x - w / 2.0, x + w / 2.0, y - h / 2.0, y + h / 2.0
+
+            if not (pl < r and l < pr and pb < t and b < pt):
+                continue
+
+            if (
+                contact_platform is None
+                or contact_platform.velocity.length_squared()
+                < terrain.velocity.length_squared()
+            ):
+                contact_platform = terrain
+
+            x_diff = 2.0 * (px - x) / w
+            y_diff = 2.0 * (py - y) / h
+
+            if y_diff >= abs(x_diff):
+                # Collides on top
+                on_ground = True
+                normal = Vec2(0.0, 1.0)
+                collision_depth = 0.5 * (ph + h) - abs(y - py)
+            elif -y_diff >= abs(x_diff):
+                # Collides on bottom
+                normal = Vec2(0.0, -1.0)
+                collision_depth = 0.5 * (ph + h) - abs(y - py)
+            elif x_diff > abs(y_diff):
+                # Collides on the right
+                normal = Vec2(1.0, 0.0)
+                collision_depth = 0.5 * (pw + w) - abs(x - px)
+            elif -x_diff > abs(y_diff):
+                # Collids on the left
+                normal = Vec2(-1.0, 0.0)
+                collision_depth = 0.5 * (pw + w) - abs(x - px)
+            else:
+                # Only reachable when the differences aren't numbers, from terrain with no size
+                raise ValueError(f"can't tell which side of {terrain} the player touched")
+
+            impulse = -1 * normal.dot(self.player_velocity - terrain.velocity)
+            self.player_velocity += max(0.0, impulse) * normal
+            self.player.position += collision_depth * normal
+
+        # Player is on the 'ground'
+        if on_ground and not self.player_on_ground:
+            if self.player_clock.time_since(self.player_jump_time) < PLAYER_CAYOTE:
+                self.player_velocity += Vec2(0.0, PLAYER_JUMP_SPEED)
+
+        if not on_ground and self.player_on_ground:
+            self.player_last_ground_time = self.player_clock.time
+        self.player_on_ground = on_ground
+        self.contact_platform = contact_platform
+        # Applying Velocity
+        self._move_player(self.player_clock.dt)
+
+        # Only the events the clock passed this update are applied or undone
+        self.events.advance(self.manipulation_clock.time)
+        self._fire_triggers()
+
+        if not self.player_reversing_time and check_for_collision(
+            self.player, self.goal
+        ):
+            self.won = True
+
+        self.player.scale_y = (
+            max(1 + -self.player_velocity[1] / SQUISH_FACTOR, 0.5) * 0.25
+        )
+
+        self.goal.update_animation(self.manipulation_clock.dt)
+
+        width, height = self.level.size
+        if (
+            abs(self.player.position.x) > 2 * width
+            or abs(self.player.position.y) > 2 * height
+        ):
+            self.fell = True
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class SlotMap(Generic[T]):
+    # Hands out integer handles for items while keeping the items densely packed.
+    # A handle is a slot number plus the slot's generation. Slots are reused
+    # once freed, but their generation goes up so old handles stop resolving.
+    # Removing swaps the last item into the hole, so the dense index of an
+    # item can change but its handle never does.
+
+    def __init__(self) -> None:
+        self.items: list[T] = []  # Dense, the index here is an item's dense index
+        self._slot_of: list[int] = []  # dense index -> slot
+        self._dense_of: list[int] = []  # slot -> dense index, -1 when free
+        self._generation: list[int] = []  # slot -> generation
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __contains__(self, handle: int) -> bool:
+        slot = handle & SLOT_MASK
+        return (
+            0 <= handle
+            and slot < len(self._dense_of)
+            and self._dense_of[slot] != -1
+            and self._generation[slot] == handle >> SLOT_BITS
+        )
+
+    def __getitem__(self, handle: int) -> T:
+        return self.items[self.index(handle)]
+
+    def index(self, handle: int) -> int:
+        """
+        Find the dense index of the item a handle refers to.
+
+        :param handle: a handle returned by `insert`.
+        :return: the item's index in `items`, and in any arrays kept parallel to it.
+        """
+        if handle not in self:
+            raise KeyError(f"{handle} is not a live handle")
+        return self._dense_of[handle & SLOT_MASK]
+
+    def insert(self, item: T) -> int:
+        """
+        Add an item to the end of the dense items.
+
+        :return: the handle for the item, valid until it is removed.
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._dense_of)
+            self._dense_of.append(-1)
+            self._generation.append(0)
+
+        self._dense_of[slot] = len(self.items)
+        self._slot_of.append(slot)
+        self.items.append(item)
+        return (self._generation[slot] << SLOT_BITS) | slot
+
+    def remove(self, handle: int) -> int:
+        """
+        Remove an item by moving the last item into its place.
+
+        Anything kept parallel to `items` should do the same swap.
+
+        :return: the dense index the item was at, which the last item now fills
+        unless the removed item was the last one.
+        """
+        idx = self.index(handle)
+        slot = handle & SLOT_MASK
+
+        last_slot = self._slot_of.pop()
+        last_item = self.items.pop()
+        if idx < len(self.items):
+            self.items[idx] = last_item
+            self._slot_of[idx] = last_slot
+            self._dense_of[last_slot] = idx
+
+        self._dense_of[slot] = -1
+        self._generation[slot] += 1
+        self._free.append(slot)
+        return idx
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from arcade.types import Rect
+
+# A body counts as fast when it moves more than this fraction of its half size
+# in one step. Anything slower can't get far enough into something to pass
+# through it before the discrete collision pushes it back out.
+FAST_FRACTION = 0.5
+
+
+def is_fast(dx: float, dy: float, width: float, height: float) -> bool:
+    return (
+        abs(dx) > FAST_FRACTION * 0.5 * width
+        or abs(dy) > FAST_FRACTION * 0.5 * height
+    )
+
+
+def time_of_impact(
+    box: Rect, dx: float, dy: float, other: Rect
+) -> tuple[float, float, float] | None:
+    """
+    Sweep an axis aligned box along a displacement and find when it first touches another box.
+
+    :param box: the moving box at the start of the step.
+    :param dx: how far the box moves along x this step, relative to the other box.
+    :param dy: how far the box moves along y this step, relative to the other box.
+    :param other: the box it could hit.
+    :return: the fraction of the step at which they touch, and the normal of
+    the face that was hit pointing back at the moving box. None if they don't
+    touch during the step, or are already overlapping at the start of it.
+    """
+    left, right, bottom, top = box.left, box.right, box.bottom, box.top
+    o_left, o_right, o_bottom, o_top = other.left, other.right, other.bottom, other.top
+
+    # When each axis starts and stops overlapping, as a fraction of the step
+    if dx > 0.0:
+        x_entry, x_exit = (o_left - right) / dx, (o_right - left) / dx
+    elif dx < 0.0:
+        x_entry, x_exit = (o_right - left) / dx, (o_left - right) / dx
+    elif left < o_right and o_left < right:
+        x_entry, x_exit = -float("inf"), float("inf")
+    else:
+        return None
+
+    if dy > 0.0:
+        y_entry, y_exit = (o_bottom - top) / dy, (o_top - bottom) / dy
+    elif dy < 0.0:
+        y_entry, y_exit = (o_top - bottom) / dy, (o_bottom - top) / dy
+    elif bottom < o_top and o_bottom < top:
+        y_entry, y_exit = -float("inf"), float("inf")
+    else:
+        return None
+
+    # They only touch once both axes overlap, and stop when either stops
+    entry, exit = max(x_entry, y_entry), min(x_exit, y_exit)
+    if entry >= exit or entry < 0.0 or entry > 1.0:
+        return None
+
+    if x_entry > y_entry:
+        return entry, -1.0 if dx > 0.0 else 1.0, 0.0
+    return entry, 0.0, -1.0 if dy > 0.0 else 1.0
@@ -0,0 +1,278 @@
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from math import ceil
+import sys
+
+import numpy as np
+
+from chrono.game.physics import Physics
+
+KEYFRAME_INTERVAL = 60  # Deltas between full keyframes, so the most a seek decodes
+# Deltas are stored as whole multiples of these, so a seek lands within half of one
+POSITION_QUANTUM = 1.0 / 64.0  # pixels
+VELOCITY_QUANTUM = 1.0 / 64.0  # pixels per second
+
+
+@dataclass(slots=True)
+class Keyframe:
+    # The full, exact state of the world at the first step of a block
+    positions: np.ndarray
+    velocities: np.ndarray
+    handles: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return _sizeof(self, self.positions, self.velocities, self.handles)
+
+
+@dataclass(slots=True)
+class Delta:
+    # The rows which changed since the previous step, and by how many quanta.
+    # Bodies that didn't move (static, sleeping, resting) aren't stored at all.
+    # Steps after the first where nothing changed are counted rather than
+    # stored, so a world at rest records nothing
+    rows: np.ndarray
+    positions: np.ndarray
+    velocities: np.ndarray
+    steps: int = 1
+
+    @property
+    def nbytes(self) -> int:
+        if self.rows is NO_ROWS:
+            return _sizeof(self)
+        return _sizeof(self, self.rows, self.positions, self.velocities)
+
+
+# Shared by every delta with no changes, they are never written to
+NO_ROWS = np.zeros(0, dtype=np.uint16)
+NO_CHANGE = np.zeros((0, 2), dtype=np.int16)
+
+
+@dataclass(slots=True)
+class Block:
+    start: int
+    keyframe: Keyframe
+    deltas: list[Delta] = field(default_factory=list)
+    steps: int = 0  # Steps the deltas cover after the keyframe's
+
+    @property
+    def end(self) -> int:
+        return self.start + self.steps
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            _sizeof(self, self.deltas)
+            + self.keyframe.nbytes
+            + sum(delta.nbytes for delta in self.deltas)
+        )
+
+    def truncate(self, step: int):
+        """Forget every step after the given one."""
+        remaining = step - self.start
+        self.steps = remaining
+        for idx, delta in enumerate(self.deltas):
+            if remaining <= 0:
+                del self.deltas[idx:]
+                return
+            delta.steps = min(delta.steps, remaining)
+            remaining -= delta.steps
+
+
+def _sizeof(*objects: object) -> int:
+    # Numpy includes the data an array owns in its size, as well as the header
+    return sum(sys.getsizeof(obj) for obj in objects)
+
+
+def _smallest_int(values: np.ndarray) -> np.ndarray:
+    if not len(values) or np.abs(values).max() <= np.iinfo(np.int16).max:
+        return values.astype(np.int16)
+    return values.astype(np.int32)
+
+
+class Timeline:
+    # Long horizon history of a Physics world, for rewind windows measured in minutes.
+    # Unlike RewindHistory it doesn't store every step in full. Every
+    # KEYFRAME_INTERVAL deltas a full keyframe is written, and each step after
+    # stores only the quantised change of the bodies that moved, with runs of
+    # steps where nothing moved merged into the delta before them. Deltas are
+    # taken against the state a seek would decode rather than the real state,
+    # so quantisation error never builds up along a block.
+
+    def __init__(
+        self,
+        physics: Physics,
+        window: int,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        max_bodies: int = 64,
+    ) -> None:
+        self._physics: Physics = physics
+        self.window: int = window
+        self.keyframe_interval: int = keyframe_interval
+
+        self._blocks: list[Block] = []
+        self._starts: list[int] = []
+        self.newest: int = -1
+
+        # Scratch space the physics is captured into every step
+        self._positions: np.ndarray = np.zeros((max_bodies, 2))
+        self._velocities: np.ndarray = np.zeros((max_bodies, 2))
+        self._handles: np.ndarray = np.zeros(max_bodies, dtype=np.int64)
+
+        # The state a seek to the newest step would produce
+        self._decoded_positions: np.ndarray = np.zeros((0, 2))
+        self._decoded_velocities: np.ndarray = np.zeros((0, 2))
+
+    @classmethod
+    def from_seconds(
+        cls,
+        physics: Physics,
+        seconds: float,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        max_bodies: int = 64,
+    ) -> Timeline:
+        steps = ceil(seconds / physics.fixed_clock.rate)
+        return cls(physics, steps, keyframe_interval, max_bodies)
+
+    @property
+    def oldest(self) -> int:
+        return self._starts[0] if self._starts else 0
+
+    def __len__(self) -> int:
+        return self.newest - self.oldest + 1
+
+    def __contains__(self, step: int) -> bool:
+        return self.oldest <= step <= self.newest
+
+    @property
+    def nbytes(self) -> int:
+        """The memory the recorded steps take, counting every object and container holding them."""
+        return (
+            _sizeof(self._blocks, self._starts, *self._starts)
+            + sum(block.nbytes for block in self._blocks)
+        )
+
+    def bytes_per_minute(self) -> float:
+        if len(self) <= 0:
+            return 0.0
+        minutes = len(self) * self._physics.fixed_clock.rate / 60.0
+        return self.nbytes / minutes
+
+    def clear(self):
+        self._blocks.clear()
+        self._starts.clear()
+        self.newest = -1
+
+    def _capture(self) -> int:
+        count = len(self._physics)
+        if count > len(self._handles):
+            size = max(count, 2 * len(self._handles))
+            self._positions = np.zeros((size, 2))
+            self._velocities = np.zeros((size, 2))
+            self._handles = np.zeros(size, dtype=np.int64)
+        return self._physics.capture(self._positions, self._velocities, self._handles)
+
+    def record(self) -> int:
+        """
+        Store the physics world's current state as the next step.
+
+        :return: the step number it was stored as.
+        """
+        count = self._capture()
+        positions, velocities = self._positions[:count], self._velocities[:count]
+        handles = self._handles[:count]
+        self.newest += 1
+
+        block = self._blocks[-1] if self._blocks else None
+        if (
+            block is None
+            or len(block.deltas) + 1 >= self.keyframe_interval
+            # Bodies were added or removed so rows no longer line up
+            or not np.array_equal(handles, block.keyframe.handles)
+        ):
+            keyframe = Keyframe(positions.copy(), velocities.copy(), handles.copy())
+            self._blocks.append(Block(self.newest, keyframe))
+            self._starts.append(self.newest)
+            self._decoded_positions = positions.copy()
+            self._decoded_velocities = velocities.copy()
+            self._drop_old()
+            return self.newest
+
+        d_positions = np.rint((positions - self._decoded_positions) / POSITION_QUANTUM)
+        d_velocities = np.rint(
+            (velocities - self._decoded_velocities) / VELOCITY_QUANTUM
+        )
+        rows = np.flatnonzero(d_positions.any(axis=1) | d_velocities.any(axis=1))
+        block.steps += 1
+        if not len(rows):
+            if block.deltas:
+                block.deltas[-1].steps += 1
+            else:
+                block.deltas.append(Delta(NO_ROWS, NO_CHANGE, NO_CHANGE))
+            return self.newest
+
+        d_positions, d_velocities = d_positions[rows], d_velocities[rows]
+        self._decoded_positions[rows] += d_positions * POSITION_QUANTUM
+        self._decoded_velocities[rows] += d_velocities * VELOCITY_QUANTUM
+
+        block.deltas.append(
+            Delta(
+                rows.astype(np.uint16 if count <= 1 << 16 else np.uint32),
+                _smallest_int(d_positions),
+                _smallest_int(d_velocities),
+            )
+        )
+        return self.newest
+
+    def _drop_old(self):
+        # Only drop a block once the rest still cover the whole window
+        while len(self._starts) > 1 and self._starts[1] <= self.newest - self.window + 1:
+            self._blocks.pop(0)
+            self._starts.pop(0)
+
+    def _decode(self, step: int) -> tuple[Block, np.ndarray, np.ndarray]:
+        block = self._blocks[bisect_right(self._starts, step) - 1]
+        positions = block.keyframe.positions.copy()
+        velocities = block.keyframe.velocities.copy()
+        remaining = step - block.start
+        for delta in block.deltas:
+            if remaining <= 0:
+                break
+            positions[delta.rows] += delta.positions * POSITION_QUANTUM
+            velocities[delta.rows] += delta.velocities * VELOCITY_QUANTUM
+            remaining -= delta.steps
+        return block, positions, velocities
+
+    def seek(self, step: int) -> bool:
+        """
+        Put the physics world back into the state it was in at a recorded step,
+        decoding forward from the keyframe before it.
+
+        :return: whether the step was still recorded.
+        """
+        if step not in self:
+            return False
+        block, positions, velocities = self._decode(step)
+        self._physics.restore(positions, velocities, block.keyframe.handles)
+        return True
+
+    def rewind(self, steps: int = 1) -> bool:
+        """
+        Go back a number of steps and forget everything after them, so recording continues from there.
+
+        :return: whether there was any history left to rewind to.
+        """
+        step = max(self.oldest, self.newest - steps)
+        if step == self.newest or step not in self:
+            return False
+
+        block, positions, velocities = self._decode(step)
+        self._physics.restore(positions, velocities, block.keyframe.handles)
+
+        idx = bisect_right(self._starts, step)
+        del self._blocks[idx:], self._starts[idx:]
+        block.truncate(step)
+        self._decoded_positions, self._decoded_velocities = positions, velocities
+        self.newest = step
+        return True
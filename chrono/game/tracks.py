@@ -0,0 +1,122 @@
+from __future__ import annotations
+from math import tau
+
+import numpy as np
+
+# How a platform moves, a level stores the index
+PATHS = ("sine", "circle", "linear", "piecewise")
+SINE, CIRCLE, LINEAR, PIECEWISE = range(len(PATHS))
+
+
+class Tracks:
+    # Where every kinematic platform in a level is at any time on the clock.
+    # Platforms are grouped by the kind of path they follow, and each group
+    # is evaluated for all its platforms at once. Position and velocity are
+    # both worked out exactly from the time, so nothing depends on the last
+    # update and the clock can jump, stop or run backwards.
+    #
+    # Each path loops every `period` seconds, offset by `phase` loops:
+    #   sine: swings about a, out to b and as far past a the other way,
+    #     easing at each end
+    #   linear: goes back and forth between a and b at a constant speed
+    #   circle: orbits a with radii b, anticlockwise from the right
+    #   piecewise: goes round its points in a closed loop at a constant speed
+
+    def __init__(self, platforms: np.ndarray, points: np.ndarray) -> None:
+        """
+        :param platforms: the level's platforms, as a PLATFORM array.
+        :param points: the level's path points, as a POINT array.
+        """
+        self._period: np.ndarray = platforms["period"].astype(np.float64)
+        self._phase: np.ndarray = platforms["phase"].astype(np.float64)
+        self._a: np.ndarray = platforms["a"].astype(np.float64)
+        self._b: np.ndarray = platforms["b"].astype(np.float64)
+
+        path = platforms["path"]
+        self._sine: np.ndarray = np.flatnonzero(path == SINE)
+        self._circle: np.ndarray = np.flatnonzero(path == CIRCLE)
+        self._linear: np.ndarray = np.flatnonzero(path == LINEAR)
+        self._piecewise: np.ndarray = np.flatnonzero(path == PIECEWISE)
+        self._build_segments(platforms[self._piecewise], points["position"])
+
+    def __len__(self) -> int:
+        return len(self._period)
+
+    def _build_segments(self, platforms: np.ndarray, points: np.ndarray):
+        # Every piecewise platform's segments go in one array, the nth
+        # platform's spanning keys n to n + 1 by how far round its loop each
+        # starts. So one search finds the segment each platform is on.
+        keys, starts, deltas, spans = [], [], [], []
+        for loop, platform in enumerate(platforms):
+            first, count = int(platform["first"]), int(platform["count"])
+            start = points[first : first + count].astype(np.float64)
+            delta = np.roll(start, -1, axis=0) - start
+            length = np.hypot(delta[:, 0], delta[:, 1])
+            moving = length > 0.0
+            if not moving.any():
+                # Every point is the same so it never moves
+                start, delta, length = start[:1], np.zeros((1, 2)), np.ones(1)
+            else:
+                start, delta, length = start[moving], delta[moving], length[moving]
+            span = length / length.sum()
+            keys.append(loop + np.cumsum(span) - span)
+            starts.append(start)
+            deltas.append(delta)
+            spans.append(span)
+
+        self._segment_keys: np.ndarray = np.concatenate((np.empty(0), *keys))
+        self._segment_starts: np.ndarray = np.concatenate((np.empty((0, 2)), *starts))
+        self._segment_deltas: np.ndarray = np.concatenate((np.empty((0, 2)), *deltas))
+        # What fraction of its loop each segment is
+        self._segment_spans: np.ndarray = np.concatenate((np.empty(0), *spans))
+        self._loops: np.ndarray = np.arange(len(platforms), dtype=np.float64)
+
+    def evaluate(self, time: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find every platform's position and velocity at a time.
+
+        :param time: the time on the clock driving the platforms.
+        :return: (n, 2) arrays of positions and of velocities in units per
+        second of that clock.
+        """
+        positions = np.empty((len(self), 2))
+        velocities = np.empty((len(self), 2))
+        loop = (time / self._period + self._phase) % 1.0
+        rate = 1.0 / self._period  # Loops per second
+
+        idx = self._sine
+        if len(idx):
+            angle = tau * loop[idx]
+            a, b = self._a[idx], self._b[idx]
+            positions[idx] = a + np.sin(angle)[:, None] * (b - a)
+            velocities[idx] = (tau * rate[idx] * np.cos(angle))[:, None] * (b - a)
+
+        idx = self._circle
+        if len(idx):
+            angle = tau * loop[idx]
+            c, s = np.cos(angle), np.sin(angle)
+            a, b = self._a[idx], self._b[idx]
+            positions[idx] = a + np.stack((c, s), axis=1) * b
+            velocities[idx] = (tau * rate[idx])[:, None] * np.stack((-s, c), axis=1) * b
+
+        idx = self._linear
+        if len(idx):
+            u = loop[idx]
+            a, b = self._a[idx], self._b[idx]
+            there = u < 0.5  # Heading from a to b
+            along = np.where(there, 2.0 * u, 2.0 - 2.0 * u)
+            positions[idx] = a + along[:, None] * (b - a)
+            speed = np.where(there, 2.0, -2.0) * rate[idx]
+            velocities[idx] = speed[:, None] * (b - a)
+
+        idx = self._piecewise
+        if len(idx):
+            key = self._loops + loop[idx]
+            segment = np.searchsorted(self._segment_keys, key, side="right") - 1
+            span = self._segment_spans[segment]
+            along = (key - self._segment_keys[segment]) / span
+            delta = self._segment_deltas[segment]
+            positions[idx] = self._segment_starts[segment] + along[:, None] * delta
+            velocities[idx] = (rate[idx] / span)[:, None] * delta
+
+        return positions, velocities
@@ -0,0 +1,96 @@
+"""
+The VHS effect drawn over the game while rewinding
+
+The scene is drawn into `scene` at full resolution, then the vhs shader
+runs over it at the quality's fraction of that resolution and the result is
+stretched back over the window. The shader's noise channel is a texture
+loaded once rather than a sprite drawn every frame. Quality is chosen by
+`[vhs] quality` in resources/data/config.toml.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import tomllib
+
+from arcade import ArcadeContext
+from arcade.experimental import Shadertoy
+from arcade.gl import Framebuffer, geometry
+
+from resources import get_data_text, get_png_path, get_shader_text
+
+
+@dataclass(slots=True, frozen=True)
+class VHSQuality:
+    scale: float  # The effect's resolution as a fraction of the screen's
+    samples: int  # How many texels of colour smear each pixel samples, at least 2
+
+
+VHS_QUALITY = {
+    "low": VHSQuality(0.25, 3),
+    "medium": VHSQuality(0.5, 6),
+    "high": VHSQuality(1.0, 6),  # What the effect originally rendered at
+}
+DEFAULT_QUALITY = "medium"
+
+
+def load_quality() -> VHSQuality:
+    """Read the quality setting from the config, falling back to DEFAULT_QUALITY."""
+    config = tomllib.loads(get_data_text("config"))
+    name = config.get("vhs", {}).get("quality", DEFAULT_QUALITY)
+    if name not in VHS_QUALITY:
+        raise ValueError(
+            f"vhs quality {name!r} isn't one of {', '.join(VHS_QUALITY)}"
+        )
+    return VHS_QUALITY[name]
+
+
+class VHS:
+
+    def __init__(
+        self,
+        ctx: ArcadeContext,
+        size: tuple[int, int],
+        quality: VHSQuality | None = None,
+    ) -> None:
+        quality = quality or load_quality()
+        if quality.samples < 2:
+            raise ValueError(f"vhs needs at least 2 samples, not {quality.samples}")
+        self._ctx = ctx
+
+        # What to draw the scene into before rendering the effect
+        self.scene: Framebuffer = ctx.framebuffer(
+            color_attachments=[ctx.texture(size, components=4)]
+        )
+        self._noise = ctx.load_texture(get_png_path("noise"))
+
+        width, height = size
+        self.size: tuple[int, int] = (
+            max(1, round(width * quality.scale)),
+            max(1, round(height * quality.scale)),
+        )
+        self._shadertoy = Shadertoy(
+            self.size, f"#define SAMPLES {quality.samples}\n" + get_shader_text("vhs")
+        )
+        self._shadertoy.channel_0 = self.scene.color_attachments[0]
+        self._shadertoy.channel_1 = self._noise
+
+        # Below full resolution the effect renders offscreen and is stretched to fit
+        self._target: Framebuffer | None = None
+        if self.size != tuple(size):
+            self._target = ctx.framebuffer(
+                color_attachments=[ctx.texture(self.size, components=4)]
+            )
+            self._quad = geometry.quad_2d_fs()
+
+    def render(self, target: Framebuffer):
+        """Render the effect over what was drawn into `scene`, filling the target."""
+        if self._target is None:
+            target.use()
+            self._shadertoy.render()
+            return
+
+        self._target.use()
+        self._shadertoy.render()
+        target.use()
+        self._target.color_attachments[0].use(0)
+        self._quad.render(self._ctx.utility_textured_quad_program)
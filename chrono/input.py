@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from pyglet.input import get_controllers
 from arcade.future.input import (
     InputManager,
@@ -13,6 +15,8 @@ from arcade.future.input import (
     AxisMapping,
 )
 
+from chrono.recording import InputLog
+
 __all__ = (
     "Input",
     "InputManager",
@@ -29,6 +33,11 @@ __all__ = (
 
 class Input:
     manager: InputManager = None
+    # While recording every fixed update's input goes into the log. While
+    # replaying live input is ignored and the log's ticks are fed back in.
+    log: InputLog = None
+    _changes: list[tuple[str, bool]] = []  # Actions since the last tick, for the log
+    _playback: Iterator[tuple[list[tuple[str, bool]], dict[str, float]]] = None
 
     @staticmethod
     def initialise():
@@ -61,6 +70,58 @@ class Input:
         m.add_axis_input("horizontal", ControllerAxes.LEFT_STICK_X, scale=-1.0)
         m.add_axis_input("horizontal", Keys.D, scale=1.0)
 
+        m.register_action_handler(Input._on_action)
+
+    @staticmethod
+    def _on_action(action: str, action_state: ActionState):
+        if Input.log is not None and Input._playback is None:
+            Input._changes.append((action, action_state == ActionState.PRESSED))
+
+    @staticmethod
+    def record(rate: float) -> InputLog:
+        """Start logging the input of every tick from now on, at rate seconds a tick."""
+        m = Input.manager
+        Input.log = InputLog(rate, list(m.actions), list(m.axes))
+        Input._changes = []
+        return Input.log
+
+    @staticmethod
+    def replay(log: InputLog):
+        """Ignore the keyboard and controller, and play the log's input back a tick at a time."""
+        m = Input.manager
+        m.allow_keyboard = False
+        m.unbind_controller()
+        Input.log = log
+        Input._playback = log.ticks()
+
+    @staticmethod
+    def update():
+        # Called once a frame
+        if Input._playback is None:
+            Input.manager.update()
+
+    @staticmethod
+    def tick() -> bool:
+        """
+        Called before every fixed update, so the log sees input exactly as the game does.
+
+        :return: False once a replay has run out of input.
+        """
+        m = Input.manager
+        if Input._playback is not None:
+            changes, axes = next(Input._playback, (None, None))
+            if changes is None:
+                return False
+            m.axes_state.update(axes)
+            for action, pressed in changes:
+                m.dispatch_action(
+                    action, ActionState.PRESSED if pressed else ActionState.RELEASED
+                )
+        elif Input.log is not None:
+            Input.log.record(Input._changes, m.axes_state)
+            Input._changes = []
+        return True
+
     @staticmethod
     def __get_item__(item):
         return Input.manager.actions
@@ -0,0 +1,140 @@
+"""
+Input logs, a play session's input one fixed update at a time
+
+Each tick of a log holds the actions pressed or released since the last
+one, in the order they happened, and every axis' value. Ticks where
+nothing was pressed or released and no axis moved are the same as the one
+before, so a run of them is stored once with how many ticks it lasts and
+idling costs nothing. Played back at the same fixed rate a log gives the
+game the exact input it had, so the same session happens again.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterator
+import struct
+
+LOG_MAGIC = b"CINP"
+LOG_VERSION = 1
+# magic, version, seconds per tick, then the bytes of the action and axis
+# name tables and the number of runs
+HEADER = struct.Struct("<4sHdIII")
+# How many ticks a run lasts, and how many action changes its first tick has.
+# Each change is a byte, the action's index shifted up one with the low bit
+# set for a press, then the run's axes follow as doubles. A run of 0 ticks
+# carries changes over to the next run's first tick, for ticks with more
+# changes than fit in one run.
+RUN = struct.Struct("<IB")
+MAX_CHANGES = 255  # The most changes a single run can hold
+
+
+class InputLogError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class Run:
+    ticks: int
+    changes: tuple[tuple[int, bool], ...]  # (action index, pressed) on the first tick
+    axes: tuple[float, ...]
+
+
+@dataclass(slots=True)
+class InputLog:
+    rate: float  # Seconds each tick simulates
+    actions: list[str]
+    axes: list[str]
+    runs: list[Run] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return sum(run.ticks for run in self.runs)
+
+    def record(self, changes: list[tuple[str, bool]], axes: dict[str, float]):
+        """
+        Add a tick to the end of the log.
+
+        :param changes: the actions pressed (True) or released (False) since the last tick.
+        :param axes: every axis' value this tick, by name.
+        """
+        values = tuple(float(axes[name]) for name in self.axes)
+        indices = tuple((self.actions.index(action), pressed) for action, pressed in changes)
+        if not indices and self.runs and self.runs[-1].axes == values:
+            self.runs[-1].ticks += 1
+            return
+        # A run can't hold more changes than fit in a byte, so the first of
+        # them go in empty runs which carry them over to this tick
+        while len(indices) > MAX_CHANGES:
+            self.runs.append(Run(0, indices[:MAX_CHANGES], values))
+            indices = indices[MAX_CHANGES:]
+        self.runs.append(Run(1, indices, values))
+
+    def ticks(self) -> Iterator[tuple[list[tuple[str, bool]], dict[str, float]]]:
+        """Go through the log a tick at a time, yielding the action changes and axes each had."""
+        changes = []
+        for run in self.runs:
+            changes.extend((self.actions[idx], pressed) for idx, pressed in run.changes)
+            if not run.ticks:
+                continue
+            axes = dict(zip(self.axes, run.axes))
+            yield changes, axes
+            changes = []
+            for _ in range(run.ticks - 1):
+                yield [], axes
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> InputLog:
+        if len(data) < HEADER.size:
+            raise InputLogError("Invalid input log: too short for the header")
+        magic, version, rate, actions_size, axes_size, count = HEADER.unpack_from(data)
+        if magic != LOG_MAGIC:
+            raise InputLogError(f"Invalid input log: not an input log, starts with {magic!r}")
+        if version != LOG_VERSION:
+            raise InputLogError(
+                f"Invalid input log: version {version}, only {LOG_VERSION} is supported"
+            )
+
+        offset = HEADER.size + actions_size
+        actions = _split_names(data[HEADER.size : offset])
+        axes = _split_names(data[offset : offset + axes_size])
+        offset += axes_size
+        values = struct.Struct(f"<{len(axes)}d")
+
+        runs = []
+        try:
+            for _ in range(count):
+                ticks, changed = RUN.unpack_from(data, offset)
+                offset += RUN.size
+                changes = tuple(
+                    (byte >> 1, bool(byte & 1)) for byte in data[offset : offset + changed]
+                )
+                offset += changed
+                runs.append(Run(ticks, changes, values.unpack_from(data, offset)))
+                offset += values.size
+        except struct.error:
+            raise InputLogError("Invalid input log: the file is truncated") from None
+        if any(idx >= len(actions) for run in runs for idx, _ in run.changes):
+            raise InputLogError("Invalid input log: a change is to an action that isn't named")
+        if runs and not runs[-1].ticks:
+            raise InputLogError("Invalid input log: the last run carries changes to no tick")
+        return cls(rate, actions, axes, runs)
+
+    def to_bytes(self) -> bytes:
+        actions = "\0".join(self.actions).encode("utf-8")
+        axes = "\0".join(self.axes).encode("utf-8")
+        values = struct.Struct(f"<{len(self.axes)}d")
+        parts = [
+            HEADER.pack(
+                LOG_MAGIC, LOG_VERSION, self.rate, len(actions), len(axes), len(self.runs)
+            ),
+            actions,
+            axes,
+        ]
+        for run in self.runs:
+            parts.append(RUN.pack(run.ticks, len(run.changes)))
+            parts.append(bytes(idx << 1 | pressed for idx, pressed in run.changes))
+            parts.append(values.pack(*run.axes))
+        return b"".join(parts)
+
+
+def _split_names(data: bytes) -> list[str]:
+    return data.decode("utf-8").split("\0") if data else []
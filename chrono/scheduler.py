@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Iterator
+
+from arcade.clock import Clock, FixedClock, GLOBAL_CLOCK, GLOBAL_FIXED_CLOCK
+
+SIMULATION_RATE = 1.0 / 60.0  # Seconds of game time each step simulates
+FRAME_RATE = 1.0 / 60.0  # Seconds between frames, the window idles in between
+MAX_CATCH_UP_STEPS = 4  # The most steps a single frame will run to catch up
+# Fixed updates per step. Substepping is global, every fixed update steps the
+# whole world, as the scheduler knows nothing of bodies. Fast bodies alone are
+# kept from skipping past things by the swept checks in Physics and Simulation
+SUBSTEPS = 1
+# How much of a fixed update the accumulated time can fall short by and still run it.
+# Float error in the clocks would otherwise leave a whole substep for the next frame.
+TOLERANCE = 1e-6
+
+
+class Scheduler:
+    # Decides how many fixed updates each frame runs.
+    # Frames only come every FRAME_RATE seconds rather than being polled as
+    # fast as possible, so the window sleeps when it is ahead. Each frame the
+    # clock moves on by however long the frame really took, and the fixed
+    # clock ticks until it catches up, once per substep. Each substep is a
+    # fixed update of everything, not only what moves fast. When a frame
+    # takes so long that catching up would need more than MAX_CATCH_UP_STEPS
+    # the extra time is dropped, so the game slows down rather than falling
+    # further behind every frame. Between fixed updates `fraction` says how far
+    # through the next one the frame is for interpolated rendering.
+
+    def __init__(
+        self,
+        rate: float = SIMULATION_RATE,
+        frame_rate: float = FRAME_RATE,
+        max_steps: int = MAX_CATCH_UP_STEPS,
+        substeps: int = SUBSTEPS,
+        clock: Clock = GLOBAL_CLOCK,
+        fixed_clock: FixedClock = GLOBAL_FIXED_CLOCK,
+    ) -> None:
+        self.rate: float = rate
+        self.frame_rate: float = frame_rate
+        self.max_steps: int = max_steps
+        self.substeps: int = substeps
+        self.clock: Clock = clock
+        # The fixed clock must tick at rate / substeps, the window sets the global one up to match
+        self.fixed_clock: FixedClock = fixed_clock
+
+        self.dropped: float = 0.0  # Total seconds thrown away to stay on schedule
+
+    @property
+    def fixed_rate(self) -> float:
+        """The seconds each fixed update simulates"""
+        return self.rate / self.substeps
+
+    @property
+    def fraction(self) -> float:
+        return self.fixed_clock.fraction
+
+    def advance(self, delta_time: float) -> Iterator[float]:
+        """
+        Move the clocks on by a frame's worth of time.
+
+        :param delta_time: how long the frame really took.
+        :return: an iterator which ticks the fixed clock, then yields its dt,
+        once for every fixed update that should run this frame.
+        """
+        # Never let more than the catch up limit build up. The half step of
+        # slack stops rounding from leaving the last step for the next frame.
+        limit = self.max_steps * self.rate + 0.5 * self.fixed_clock.rate
+        accepted = min(delta_time, max(0.0, limit - self.fixed_clock.accumulated))
+        self.dropped += delta_time - accepted
+        self.clock.tick(accepted)
+
+        fixed_rate = self.fixed_clock.rate
+        due = fixed_rate * (1.0 - TOLERANCE)
+        while self.fixed_clock.accumulated >= due:
+            self.fixed_clock.tick(fixed_rate)
+            yield fixed_rate
@@ -1,8 +1,12 @@
+from pathlib import Path
+
 from arcade import Window as _Window, View, draw_text, load_sound
 from chrono.nav import Navigation, CreationNavigation, PreserveNavigation
 from resources import get_wav_path
 
 from chrono.input import Input
+from chrono.recording import InputLog
+from chrono.scheduler import Scheduler
 
 from chrono.menus.main_menu import MainMenu
 from chrono.menus.win_menu import WinMenu
@@ -12,8 +16,17 @@ from chrono.game.physics_view import PhysicsView
 
 class Window(_Window):
 
-    def __init__(self):
-        super().__init__(1280, 720, "Chrono - UoA GDG Jam 2", update_rate=1 / 1000)
+    def __init__(self, scheduler: Scheduler | None = None):
+        scheduler = scheduler or Scheduler()
+        super().__init__(
+            1280,
+            720,
+            "Chrono - UoA GDG Jam 2",
+            update_rate=scheduler.frame_rate,
+            draw_rate=scheduler.frame_rate,
+            fixed_rate=scheduler.fixed_rate,
+        )
+        self.scheduler: Scheduler = scheduler
         self.nav_sound = load_sound(get_wav_path("blip_a"))
         Input.initialise()
 
@@ -24,7 +37,11 @@ class Window(_Window):
         self._physics_view: PhysicsView = None
 
     @classmethod
-    def launch(cls):
+    def launch(cls, record: Path | None = None, replay: Path | None = None):
+        """
+        :param record: write the input of the session to this file when the window closes.
+        :param replay: play back the input recorded in this file, then close.
+        """
         win = cls()
         win.register_nav("to_main_menu", CreationNavigation(MainMenu))
         win.register_nav("to_win_menu", CreationNavigation(WinMenu))
@@ -44,12 +61,37 @@ class Window(_Window):
             ),
         )
         win.center_window()
-        win.nav("to_main_menu")
+        if record is None and replay is None:
+            win.nav("to_main_menu")
+        else:
+            # Menus aren't driven by actions, so recordings start straight in the game
+            win.nav("to_game_levelless")
+            if replay is not None:
+                Input.replay(InputLog.from_bytes(replay.read_bytes()))
+            else:
+                Input.record(win.scheduler.fixed_rate)
         win.run()
 
+        if record is not None:
+            record.write_bytes(Input.log.to_bytes())
+
+    def close(self) -> None:
+        # Closing the window doesn't hide the current view, so the game view's
+        # loading thread is stopped here
+        if self._game_view is not None:
+            self._game_view.close()
+        super().close()
+
     def _dispatch_updates(self, delta_time: float) -> None:
-        Input.manager.update()
-        super()._dispatch_updates(delta_time)
+        # Replaces arcade's own fixed update loop so catching up is capped
+        Input.update()
+        for fixed_delta in self.scheduler.advance(delta_time):
+            if not Input.tick():
+                # The replay is over
+                self.close()
+                return
+            self.dispatch_event("on_fixed_update", fixed_delta)
+        self.dispatch_event("on_update", self.scheduler.clock.delta_time)
 
     def register_nav(
         self, name: str, nav: Navigation, *, replace: bool = False
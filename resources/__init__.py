@@ -26,10 +26,12 @@ __all__ = (
     "get_wav_path",
     "get_ogg_path",
     "get_data_path",
+    "get_level_path",
     "get_png_path",
     "get_shader_path",
     "get_shader_text",
     "get_data_text",
+    "get_level_binary",
     "open_png",
 )
 
@@ -128,6 +130,7 @@ get_font_path = make_package_path_finder(fonts, "ttf")
 get_wav_path = make_package_path_finder(audio, "wav")
 get_ogg_path = make_package_path_finder(audio, "ogg")
 get_data_path = make_package_path_finder(data, "toml")
+get_level_path = make_package_path_finder(data, "lvl")
 get_png_path = make_package_path_finder(texts, "png")
 get_shader_path = make_package_path_finder(shaders, "glsl")
 
@@ -135,6 +138,9 @@ get_shader_path = make_package_path_finder(shaders, "glsl")
 get_shader_text = make_package_string_loader(shaders, "glsl")
 get_data_text = make_package_string_loader(data, "toml")
 
+# get binary
+get_level_binary = make_package_binary_loader(data, "lvl")
+
 # open file
 open_png = make_package_file_opener(texts, "png", mode="rb")
 
@@ -1,6 +1,7 @@
 #define V vec2(0.,1.)
 #define PI 3.14159265
 #define HUGE 1E9
+// The effect is sized in pixels of a 1280x720 tape, whatever resolution it is rendered at
 #define VHSRES vec2(1280.0,720.0)
 #define saturate(i) clamp(i,0.,1.)
 #define lofi(i,d) floor(i/d)*d
@@ -22,7 +23,10 @@ vec3 yiq2rgb( vec3 yiq ) {
   return mat3( 1.000, 1.000, 1.000, 0.956, -0.272, -1.106, 0.621, -0.647, 1.703 ) * yiq;
 }
 
+// How many texels of colour smear each pixel samples, at least 2. The game defines it from its quality setting
+#ifndef SAMPLES
 #define SAMPLES 6
+#endif
 
 vec3 vhsTex2D( vec2 uv, float rot ) {
   if ( validuv( uv ) ) {
@@ -40,7 +44,7 @@ vec3 vhsTex2D( vec2 uv, float rot ) {
 }
 
 void mainImage( out vec4 fragColor, in vec2 fragCoord ) {
-  vec2 uv = fragCoord.xy / VHSRES;
+  vec2 uv = fragCoord.xy / iResolution.xy;
   float time = iTime;
 
   vec2 uvn = uv;